@@ -6,6 +6,7 @@ enterprise security, quantum debugging, and Podman containerization.
 """
 
 import json
+import re
 import sys
 import os
 import asyncio
@@ -15,23 +16,38 @@ import logging
 import platform
 import subprocess
 import tempfile
-import traceback
 import hashlib
+import concurrent.futures
+import functools
+import itertools
+import collections
+import io
+import queue
+import atexit
+import threading
+import logging.handlers
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
-import psutil
 
-# Desktop integration imports
+# Prefer orjson for audit, metrics and artifact records, falling back to stdlib json
 try:
-    import aiofiles
-    import cryptography
-    from cryptography.fernet import Fernet
-    import jwt
-except ImportError as e:
-    logging.warning(f"Optional dependency not available: {e}")
+    import orjson
+    
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=str)
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, default=str, separators=(',', ':')).encode('utf-8')
+    
+    _loads = json.loads
+
+# Heavier dependencies (cryptography, psutil, win10toast) are imported where
+# they are first used so the server starts without loading them
 
 # Set up comprehensive logging
 def setup_logging():
@@ -51,50 +67,294 @@ def setup_logging():
         ]
     )
     
-    # Rotate logs (keep last 7 days)
-    for old_log in config_dir.glob('claude-jester-*.log'):
-        if (datetime.now() - datetime.fromtimestamp(old_log.stat().st_mtime)).days > 7:
-            old_log.unlink()
+    # Rotate logs (keep last 7 days; anything a full 8 days old goes)
+    cutoff = time.time() - 8 * 86400
+    with os.scandir(config_dir) as entries:
+        for entry in entries:
+            if (entry.name.startswith('claude-jester-') and entry.name.endswith('.log')
+                    and entry.stat().st_mtime <= cutoff):
+                os.unlink(entry.path)
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# Host details recorded with every execution; queried once since they cannot change
+_PLATFORM_INFO = {
+    'system': platform.system(),
+    'release': platform.release(),
+    'python_version': platform.python_version(),
+    'architecture': platform.architecture()[0],
+    'processor': platform.processor()
+}
+
+# System Information lines of the diagnostics report, which never change
+_PLATFORM_SECTION = (
+    f"**System Information:**\n"
+    f"  - Platform: {_PLATFORM_INFO['system']} {_PLATFORM_INFO['release']}\n"
+    f"  - Python: {_PLATFORM_INFO['python_version']}\n"
+    f"  - Architecture: {_PLATFORM_INFO['architecture']}\n"
+    f"  - Processor: {_PLATFORM_INFO['processor']}\n"
+)
+
+# Report markers for security risk levels and performance trends
+RISK_EMOJI = {"low": "🟢", "medium": "🟡", "high": "🔴"}
+TREND_EMOJI = {"improving": "📈", "degrading": "📉", "stable": "➡️"}
+
+# Code patterns checked by the security analysis and compliance audit
+HIGH_RISK_PATTERNS = [
+    ('os.system', 'System command execution'),
+    ('subprocess.call', 'Subprocess execution'),
+    ('eval(', 'Dynamic code evaluation'),
+    ('exec(', 'Dynamic code execution'),
+    ('__import__', 'Dynamic imports'),
+    ('open(', 'File access'),
+]
+
+MEDIUM_RISK_PATTERNS = [
+    ('import os', 'Operating system access'),
+    ('import subprocess', 'Subprocess module'),
+    ('import socket', 'Network socket access'),
+    ('urllib', 'Network requests'),
+    ('requests', 'HTTP requests'),
+]
+
+COMPLIANCE_PATTERNS = [
+    ('subprocess', 'SUBPROCESS_USAGE'),
+    ('os.system', 'SYSTEM_COMMAND'),
+    ('eval(', 'EVAL_USAGE'),
+    ('exec(', 'EXEC_USAGE'),
+    ('import requests', 'NETWORK_ACCESS'),
+    ('urllib', 'NETWORK_ACCESS'),
+    ('socket', 'SOCKET_USAGE')
+]
+
+_ALL_PATTERNS = sorted(
+    {pattern for pattern, _ in HIGH_RISK_PATTERNS + MEDIUM_RISK_PATTERNS + COMPLIANCE_PATTERNS},
+    key=len, reverse=True
+)
+# Lookahead so overlapping patterns are still found; longest alternative wins at each position
+_PATTERN_RE = re.compile('(?=(' + '|'.join(map(re.escape, _ALL_PATTERNS)) + '))')
+# Shorter patterns that also match wherever a longer one does (e.g. 'subprocess' in 'subprocess.call')
+_PATTERN_PREFIXES = {
+    pattern: [other for other in _ALL_PATTERNS if pattern.startswith(other)]
+    for pattern in _ALL_PATTERNS
+}
+
+# Branching keywords counted by the complexity approximation
+_COMPLEXITY_RE = re.compile(r'\b(?:if|elif|else|for|while|try|except|finally|with)\b')
+
+CODE_HASH_ALG = 'blake2b-256'  # Recorded alongside code_hash in audit entries
+_HASH_CHUNK = 64 * 1024  # Characters encoded per step when hashing large code
+
+# The last string hashed and its digest. One request passes the same code
+# object through analysis, auditing and metrics, so it is hashed once
+_last_hash = (None, '')
+
+def _code_hash(code: str) -> str:
+    """Content identifier for code, reused when the same snippet is executed again"""
+    global _last_hash
+    last_code, last_digest = _last_hash
+    if last_code is code:
+        return last_digest
+    
+    if len(code) <= _HASH_CHUNK:
+        digest = hashlib.blake2b(code.encode(), digest_size=32).hexdigest()
+    else:
+        # Encode large pastes a chunk at a time rather than materialising a full copy
+        hasher = hashlib.blake2b(digest_size=32)
+        for start in range(0, len(code), _HASH_CHUNK):
+            hasher.update(code[start:start + _HASH_CHUNK].encode())
+        digest = hasher.hexdigest()
+    _last_hash = (code, digest)
+    return digest
+
+def _memoize_by_digest(maxsize: int):
+    """Like lru_cache on a code argument, but keyed on its digest so past submissions are not kept alive"""
+    def decorator(func):
+        cache = collections.OrderedDict()
+        lock = threading.Lock()
+        
+        @functools.wraps(func)
+        def wrapper(code: str):
+            key = _code_hash(code)
+            with lock:
+                if key in cache:
+                    cache.move_to_end(key)
+                    return cache[key]
+            value = func(code)
+            with lock:
+                cache[key] = value
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return value
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+@_memoize_by_digest(maxsize=256)
+def _match_patterns(code: str) -> frozenset:
+    """Find every known pattern in code with a single regex pass"""
+    found = set()
+    for match in _PATTERN_RE.finditer(code):
+        found.update(_PATTERN_PREFIXES[match.group(1)])
+    return frozenset(found)
+
+@_memoize_by_digest(maxsize=512)
+def _security_verdict(code: str) -> tuple:
+    """Risk level, issues, recommendations and detected patterns for code, as immutable tuples"""
+    found = _match_patterns(code)
+    high_risk_found = tuple(description for pattern, description in HIGH_RISK_PATTERNS if pattern in found)
+    medium_risk_found = tuple(description for pattern, description in MEDIUM_RISK_PATTERNS if pattern in found)
+    
+    # Determine risk level
+    if high_risk_found:
+        return 'high', high_risk_found, ('Consider using containerized execution',), high_risk_found + medium_risk_found
+    elif medium_risk_found:
+        return 'medium', medium_risk_found, ('Review network and file access patterns',), medium_risk_found
+    return 'low', (), (), ()
+
+@_memoize_by_digest(maxsize=512)
+def _code_complexity(code: str) -> int:
+    """Simple code complexity calculation"""
+    # Basic cyclomatic complexity approximation: 1 + branching keywords
+    return 1 + len(_COMPLEXITY_RE.findall(code))
+
 # ===== DESKTOP EXTENSION FRAMEWORK =====
 
+_PS_QUOTES = re.compile("['\u2018\u2019\u201a\u201b]")
+
+def _applescript_quote(text: str) -> str:
+    """Quote text as an AppleScript string literal"""
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def _powershell_quote(text: str) -> str:
+    """Quote text as a single-line PowerShell verbatim string"""
+    # PowerShell also treats the typographic single quotes as delimiters
+    return "'" + _PS_QUOTES.sub(lambda m: m.group() * 2, text.replace('\r', ' ').replace('\n', ' ')) + "'"
+
 class DesktopNotification:
     """Cross-platform desktop notifications"""
     
+    _pending = set()  # Strong references to in-flight notification tasks
+    RATE_LIMIT_SECONDS = 5.0
+    COMMAND_TIMEOUT = 10.0
+    # Blocking win10toast calls run here, away from the default executor reading stdin
+    _toast_pool = None
+    _last_sent = {}  # (title, message) -> monotonic time last scheduled
+    
+    @staticmethod
+    def _command(title: str, message: str) -> Optional[List[str]]:
+        """Build the notifier command line for the current platform"""
+        system = platform.system().lower()
+        
+        if system == "darwin":  # macOS
+            script = f'display notification {_applescript_quote(message)} with title {_applescript_quote(title)}'
+            return ["osascript", "-e", script]
+            
+        elif system == "windows":  # Windows
+            return [
+                "powershell", "-Command",
+                f'[Windows.UI.Notifications.ToastNotificationManager, Windows.UI.Notifications, ContentType = WindowsRuntime] | Out-Null; [Windows.Data.Xml.Dom.XmlDocument, Windows.Data.Xml.Dom.XmlDocument, ContentType = WindowsRuntime] | Out-Null; $template = [Windows.UI.Notifications.ToastNotificationManager]::GetTemplateContent([Windows.UI.Notifications.ToastTemplateType]::ToastText02); $template.GetElementsByTagName("text")[0].AppendChild($template.CreateTextNode({_powershell_quote(title)})) | Out-Null; $template.GetElementsByTagName("text")[1].AppendChild($template.CreateTextNode({_powershell_quote(message)})) | Out-Null; [Windows.UI.Notifications.ToastNotificationManager]::CreateToastNotifier("Claude-Jester").Show([Windows.UI.Notifications.ToastNotification]::new($template))'
+            ]
+            
+        elif system == "linux":  # Linux
+            return ["notify-send", title, message]
+        
+        return None
+    
+    @staticmethod
+    def _toast(title: str, message: str) -> bool:
+        """Show a native Windows toast, returning False if win10toast is unavailable"""
+        try:
+            import win10toast
+        except ImportError:
+            return False
+        toaster = win10toast.ToastNotifier()
+        toaster.show_toast(title, message, duration=5)
+        return True
+    
     @staticmethod
     def send(title: str, message: str, notification_type: str = "info"):
         """Send desktop notification"""
         try:
-            system = platform.system().lower()
+            if platform.system().lower() == "windows" and DesktopNotification._toast(title, message):
+                return
             
-            if system == "darwin":  # macOS
-                script = f'''
-                display notification "{message}" with title "{title}"
-                '''
-                subprocess.run(["osascript", "-e", script], check=False)
+            command = DesktopNotification._command(title, message)
+            if command:
+                subprocess.run(command, check=False, timeout=DesktopNotification.COMMAND_TIMEOUT)
                 
-            elif system == "windows":  # Windows
+        except Exception as e:
+            logger.warning(f"Failed to send notification: {e}")
+    
+    @staticmethod
+    async def send_async(title: str, message: str, notification_type: str = "info"):
+        """Send desktop notification without blocking the event loop"""
+        try:
+            cls = DesktopNotification
+            if platform.system().lower() == "windows":
+                if cls._toast_pool is None:
+                    cls._toast_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='jester-notify')
+                loop = asyncio.get_running_loop()
+                if await loop.run_in_executor(cls._toast_pool, cls._toast, title, message):
+                    return
+            
+            command = cls._command(title, message)
+            if command:
+                proc = await asyncio.create_subprocess_exec(
+                    *command,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
                 try:
-                    import win10toast
-                    toaster = win10toast.ToastNotifier()
-                    toaster.show_toast(title, message, duration=5)
-                except ImportError:
-                    # Fallback to Windows notification
-                    subprocess.run([
-                        "powershell", "-Command",
-                        f'[Windows.UI.Notifications.ToastNotificationManager, Windows.UI.Notifications, ContentType = WindowsRuntime] | Out-Null; [Windows.Data.Xml.Dom.XmlDocument, Windows.Data.Xml.Dom.XmlDocument, ContentType = WindowsRuntime] | Out-Null; $template = [Windows.UI.Notifications.ToastNotificationManager]::GetTemplateContent([Windows.UI.Notifications.ToastTemplateType]::ToastText02); $template.GetElementsByTagName("text")[0].AppendChild($template.CreateTextNode("{title}")) | Out-Null; $template.GetElementsByTagName("text")[1].AppendChild($template.CreateTextNode("{message}")) | Out-Null; [Windows.UI.Notifications.ToastNotificationManager]::CreateToastNotifier("Claude-Jester").Show([Windows.UI.Notifications.ToastNotification]::new($template))'
-                    ], check=False)
-                    
-            elif system == "linux":  # Linux
-                subprocess.run([
-                    "notify-send", title, message
-                ], check=False)
+                    await asyncio.wait_for(proc.wait(), cls.COMMAND_TIMEOUT)
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    await proc.wait()
+                    raise
                 
         except Exception as e:
             logger.warning(f"Failed to send notification: {e}")
+    
+    @classmethod
+    def _rate_limited(cls, title: str, message: str) -> bool:
+        """True if the same notification went out within RATE_LIMIT_SECONDS"""
+        now = time.monotonic()
+        key = (title, message)
+        last = cls._last_sent.get(key)
+        if last is not None and now - last < cls.RATE_LIMIT_SECONDS:
+            return True
+        
+        # Expire old keys lazily as new ones arrive
+        if last is None:
+            for stale in [k for k, t in cls._last_sent.items() if now - t >= cls.RATE_LIMIT_SECONDS]:
+                del cls._last_sent[stale]
+        cls._last_sent[key] = now
+        return False
+    
+    @classmethod
+    def notify(cls, title: str, message: str, notification_type: str = "info"):
+        """Schedule a notification on the running loop, or send it directly outside one"""
+        if cls._rate_limited(title, message):
+            logger.debug(f"Notification rate limited: {title}")
+            return
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            cls.send(title, message, notification_type)
+            return
+        
+        task = loop.create_task(cls.send_async(title, message, notification_type))
+        cls._pending.add(task)
+        task.add_done_callback(cls._pending.discard)
+
+@functools.lru_cache(maxsize=4)
+def _get_fernet(key: bytes):
+    """Shared Fernet instance per key; thread-safe and reused by every SecureStorage"""
+    from cryptography.fernet import Fernet
+    return Fernet(key)
 
 class SecureStorage:
     """Secure storage for sensitive configuration data"""
@@ -103,6 +363,7 @@ class SecureStorage:
         self.config_dir = config_dir
         self.key_file = config_dir / '.encryption_key'
         self._key = self._get_or_create_key()
+        self._fernet = _get_fernet(self._key)
     
     def _get_or_create_key(self) -> bytes:
         """Get or create encryption key"""
@@ -110,6 +371,7 @@ class SecureStorage:
             with open(self.key_file, 'rb') as f:
                 return f.read()
         else:
+            from cryptography.fernet import Fernet
             key = Fernet.generate_key()
             self.key_file.write_bytes(key)
             self.key_file.chmod(0o600)  # Owner read/write only
@@ -118,8 +380,7 @@ class SecureStorage:
     def encrypt(self, data: str) -> str:
         """Encrypt sensitive data"""
         try:
-            f = Fernet(self._key)
-            return f.encrypt(data.encode()).decode()
+            return self._fernet.encrypt(data.encode()).decode()
         except Exception as e:
             logger.error(f"Encryption failed: {e}")
             return data
@@ -127,58 +388,76 @@ class SecureStorage:
     def decrypt(self, encrypted_data: str) -> str:
         """Decrypt sensitive data"""
         try:
-            f = Fernet(self._key)
-            return f.decrypt(encrypted_data.encode()).decode()
+            return self._fernet.decrypt(encrypted_data.encode()).decode()
         except Exception as e:
             logger.error(f"Decryption failed: {e}")
             return encrypted_data
 
+def _to_bool(value: str) -> bool:
+    """Parse a 'true'/'false' environment value"""
+    return value.lower() == 'true'
+
+def _to_list(value: str) -> List[str]:
+    """Parse a comma-separated environment value"""
+    return value.split(',')
+
 class DesktopConfig:
     """Desktop extension configuration management"""
     
+    # (attribute, environment variable, parser, default)
+    ENV_SETTINGS = (
+        ('security_level', 'CLAUDE_JESTER_SECURITY_LEVEL', str, 'balanced'),
+        ('allowed_languages', 'CLAUDE_JESTER_ALLOWED_LANGUAGES', _to_list, 'python,javascript,bash'),
+        ('podman_enabled', 'CLAUDE_JESTER_PODMAN_ENABLED', _to_bool, 'true'),
+        ('quantum_debugging', 'CLAUDE_JESTER_QUANTUM_ENABLED', _to_bool, 'true'),
+        ('performance_monitoring', 'CLAUDE_JESTER_PERFORMANCE_MONITORING', _to_bool, 'true'),
+        ('enterprise_mode', 'CLAUDE_JESTER_ENTERPRISE_MODE', _to_bool, 'false'),
+        ('max_execution_time', 'CLAUDE_JESTER_MAX_EXECUTION_TIME', int, '30'),
+        ('max_memory_mb', 'CLAUDE_JESTER_MAX_MEMORY_MB', int, '256'),
+        ('log_level', 'CLAUDE_JESTER_LOG_LEVEL', str, 'INFO'),
+        ('notify_enabled', 'CLAUDE_JESTER_NOTIFICATIONS_ENABLED', _to_bool, 'true'),
+        ('notify_security', 'CLAUDE_JESTER_SECURITY_ALERTS', _to_bool, 'true'),
+        ('notify_perf', 'CLAUDE_JESTER_PERFORMANCE_INSIGHTS', _to_bool, 'false'),
+        ('notify_quantum', 'CLAUDE_JESTER_QUANTUM_RESULTS', _to_bool, 'true'),
+    )
+    
+    # Notification preference names exposed by the notifications view
+    NOTIFICATION_KEYS = (
+        ('enabled', 'notify_enabled'),
+        ('security_alerts', 'notify_security'),
+        ('performance_insights', 'notify_perf'),
+        ('quantum_results', 'notify_quantum'),
+    )
+    
     def __init__(self):
         self.config_dir = Path(os.getenv('CLAUDE_JESTER_CONFIG_DIR', Path.home() / '.claude-jester'))
         self.data_dir = Path(os.getenv('CLAUDE_JESTER_DATA_DIR', self.config_dir / 'data'))
         self.workspace_dir = None
         self.config_file = self.config_dir / 'config.json'
         
-        self.config_dir.mkdir(exist_ok=True)
-        self.data_dir.mkdir(exist_ok=True)
+        self._load_config()
+        self._ensure_dirs()
         
         self.secure_storage = SecureStorage(self.config_dir)
-        self._load_config()
+    
+    def _ensure_dirs(self):
+        """Create the config, data and workspace directories"""
+        for path in (self.config_dir, self.data_dir):
+            os.makedirs(path, exist_ok=True)
+        
+        try:
+            os.makedirs(self.workspace_dir, exist_ok=True)
+        except OSError as e:
+            # An unusable configured workspace falls back to the defaults
+            logger.error(f"Failed to create workspace {self.workspace_dir}: {e}")
+            self._set_defaults()
+            os.makedirs(self.workspace_dir, exist_ok=True)
     
     def _load_config(self):
         """Load configuration from desktop extension"""
         try:
             # Desktop extensions pass config via environment variables
-            self.security_level = os.getenv('CLAUDE_JESTER_SECURITY_LEVEL', 'balanced')
-            self.allowed_languages = os.getenv('CLAUDE_JESTER_ALLOWED_LANGUAGES', 'python,javascript,bash').split(',')
-            self.podman_enabled = os.getenv('CLAUDE_JESTER_PODMAN_ENABLED', 'true').lower() == 'true'
-            self.quantum_debugging = os.getenv('CLAUDE_JESTER_QUANTUM_ENABLED', 'true').lower() == 'true'
-            self.performance_monitoring = os.getenv('CLAUDE_JESTER_PERFORMANCE_MONITORING', 'true').lower() == 'true'
-            self.enterprise_mode = os.getenv('CLAUDE_JESTER_ENTERPRISE_MODE', 'false').lower() == 'true'
-            self.max_execution_time = int(os.getenv('CLAUDE_JESTER_MAX_EXECUTION_TIME', '30'))
-            self.max_memory_mb = int(os.getenv('CLAUDE_JESTER_MAX_MEMORY_MB', '256'))
-            self.log_level = os.getenv('CLAUDE_JESTER_LOG_LEVEL', 'INFO')
-            
-            # Workspace directory
-            workspace_env = os.getenv('CLAUDE_JESTER_WORKSPACE_DIRECTORY')
-            if workspace_env:
-                self.workspace_dir = Path(workspace_env)
-                self.workspace_dir.mkdir(parents=True, exist_ok=True)
-            else:
-                self.workspace_dir = self.data_dir / 'workspace'
-                self.workspace_dir.mkdir(exist_ok=True)
-            
-            # Notification preferences
-            self.notifications = {
-                'enabled': os.getenv('CLAUDE_JESTER_NOTIFICATIONS_ENABLED', 'true').lower() == 'true',
-                'security_alerts': os.getenv('CLAUDE_JESTER_SECURITY_ALERTS', 'true').lower() == 'true',
-                'performance_insights': os.getenv('CLAUDE_JESTER_PERFORMANCE_INSIGHTS', 'false').lower() == 'true',
-                'quantum_results': os.getenv('CLAUDE_JESTER_QUANTUM_RESULTS', 'true').lower() == 'true'
-            }
-            
+            self._apply_settings(os.environ)
             logger.info(f"Desktop extension configuration loaded: security_level={self.security_level}, workspace={self.workspace_dir}")
             
         except Exception as e:
@@ -187,23 +466,21 @@ class DesktopConfig:
     
     def _set_defaults(self):
         """Set default configuration values"""
-        self.security_level = 'balanced'
-        self.allowed_languages = ['python', 'javascript', 'bash']
-        self.podman_enabled = True
-        self.quantum_debugging = True
-        self.performance_monitoring = True
-        self.enterprise_mode = False
-        self.max_execution_time = 30
-        self.max_memory_mb = 256
-        self.log_level = 'INFO'
-        self.workspace_dir = self.data_dir / 'workspace'
-        self.workspace_dir.mkdir(exist_ok=True)
-        self.notifications = {
-            'enabled': True,
-            'security_alerts': True,
-            'performance_insights': False,
-            'quantum_results': True
-        }
+        self._apply_settings({})
+    
+    def _apply_settings(self, env):
+        """Assign every setting from env, falling back to its default"""
+        for attr, env_key, parse, default in self.ENV_SETTINGS:
+            setattr(self, attr, parse(env.get(env_key, default)))
+        
+        # Workspace directory
+        workspace_env = env.get('CLAUDE_JESTER_WORKSPACE_DIRECTORY')
+        self.workspace_dir = Path(workspace_env) if workspace_env else self.data_dir / 'workspace'
+    
+    @property
+    def notifications(self) -> Dict[str, bool]:
+        """Read-only snapshot of the notification preferences; set the notify_* attributes to change them"""
+        return {key: getattr(self, attr) for key, attr in self.NOTIFICATION_KEYS}
 
 # ===== ENHANCED EXECUTION FRAMEWORK =====
 
@@ -236,6 +513,36 @@ class DesktopExecutionResult:
         if self.quantum_insights is None:
             self.quantum_insights = {}
 
+class _BatchingAuditHandler(logging.handlers.MemoryHandler):
+    """Buffers audit records, flushing on capacity, on WARNING+ records, or every few seconds"""
+    
+    def __init__(self, target: logging.Handler, capacity: int = 64, flush_interval: float = 5.0):
+        super().__init__(capacity, flushLevel=logging.WARNING, target=target)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        # Flushes on a timer too, so a lone entry after a quiet spell reaches disk
+        self._stop_timer = threading.Event()
+        self._timer = threading.Thread(target=self._flush_periodically, name="audit-flush", daemon=True)
+        self._timer.start()
+    
+    def _flush_periodically(self):
+        while not self._stop_timer.wait(self.flush_interval):
+            if self.buffer:
+                self.flush()
+    
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        return (super().shouldFlush(record) or
+                time.monotonic() - self._last_flush >= self.flush_interval)
+    
+    def flush(self):
+        super().flush()
+        self._last_flush = time.monotonic()
+    
+    def close(self):
+        self._stop_timer.set()
+        self._timer.join()
+        super().close()
+
 class DesktopAuditLogger:
     """Enhanced audit logging for enterprise compliance"""
     
@@ -243,6 +550,26 @@ class DesktopAuditLogger:
         self.config = config
         self.audit_file = config.data_dir / 'audit.log'
         self.session_id = str(uuid.uuid4())
+        
+        # Audit lines are queued on the hot path and written in batches by a
+        # background thread; high-risk entries are flushed immediately
+        self._audit_queue = queue.Queue(-1)
+        file_handler = logging.FileHandler(self.audit_file, encoding='utf-8', delay=True)
+        file_handler.setFormatter(logging.Formatter('%(message)s'))
+        audit_handler = _BatchingAuditHandler(file_handler)
+        self._audit_listener = logging.handlers.QueueListener(self._audit_queue, audit_handler)
+        self._audit_listener.start()
+        atexit.register(self.close)
+    
+    def close(self):
+        """Flush pending audit entries and stop the background writer"""
+        if self._audit_listener is not None:
+            self._audit_listener.stop()
+            for handler in self._audit_listener.handlers:
+                target = handler.target
+                handler.close()  # Flushes buffered entries to the file handler
+                target.close()
+            self._audit_listener = None
     
     def log_execution(self, result: DesktopExecutionResult, code: str, language: str, user_context: Dict[str, Any] = None):
         """Log execution for audit trail"""
@@ -252,7 +579,8 @@ class DesktopAuditLogger:
                 'session_id': self.session_id,
                 'execution_id': result.session_id,
                 'language': language,
-                'code_hash': hashlib.sha256(code.encode()).hexdigest(),
+                'code_hash': _code_hash(code),
+                'code_hash_alg': CODE_HASH_ALG,
                 'code_length': len(code),
                 'security_level': result.security_level,
                 'execution_time': result.execution_time,
@@ -262,9 +590,9 @@ class DesktopAuditLogger:
                 'container_id': result.container_id,
                 'user_context': user_context or {},
                 'platform': {
-                    'system': platform.system(),
-                    'python_version': platform.python_version(),
-                    'architecture': platform.architecture()[0]
+                    'system': _PLATFORM_INFO['system'],
+                    'python_version': _PLATFORM_INFO['python_version'],
+                    'architecture': _PLATFORM_INFO['architecture']
                 }
             }
             
@@ -276,53 +604,119 @@ class DesktopAuditLogger:
                     'compliance_flags': self._check_compliance(code, language)
                 })
             
-            with open(self.audit_file, 'a') as f:
-                f.write(json.dumps(audit_entry) + '\n')
+            high_risk = (result.security_analysis or {}).get('risk_level') == 'high'
+            self._audit_queue.put_nowait(logging.makeLogRecord({
+                'msg': _dumps(audit_entry).decode('utf-8'),
+                'levelno': logging.WARNING if high_risk else logging.INFO
+            }))
                 
         except Exception as e:
             logger.error(f"Audit logging failed: {e}")
     
     def _check_compliance(self, code: str, language: str) -> List[str]:
         """Check code for compliance violations"""
-        flags = []
-        
-        # Basic compliance checks
-        dangerous_patterns = [
-            ('subprocess', 'SUBPROCESS_USAGE'),
-            ('os.system', 'SYSTEM_COMMAND'),
-            ('eval(', 'EVAL_USAGE'),
-            ('exec(', 'EXEC_USAGE'),
-            ('import requests', 'NETWORK_ACCESS'),
-            ('urllib', 'NETWORK_ACCESS'),
-            ('socket', 'SOCKET_USAGE')
-        ]
-        
-        for pattern, flag in dangerous_patterns:
-            if pattern in code:
-                flags.append(flag)
-        
-        return flags
+        found = _match_patterns(code)
+        return [flag for pattern, flag in COMPLIANCE_PATTERNS if pattern in found]
+
+class _RollingHistory(collections.deque):
+    """Bounded history that keeps running sums over the most recent entries"""
+    
+    def __init__(self, maxlen: int):
+        super().__init__(maxlen=maxlen)
+        self.sum_time_5 = 0.0
+        self.sum_time_10 = 0.0
+        self.sum_mem_5 = 0.0
+    
+    def append(self, entry: Dict[str, Any]):
+        super().append(entry)
+        self.sum_time_5 += entry['execution_time']
+        self.sum_time_10 += entry['execution_time']
+        self.sum_mem_5 += entry['memory_usage']
+        
+        # Drop the entries that just left each window
+        if len(self) > 5:
+            self.sum_time_5 -= self[-6]['execution_time']
+            self.sum_mem_5 -= self[-6]['memory_usage']
+        if len(self) > 10:
+            self.sum_time_10 -= self[-11]['execution_time']
+    
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+    
+    def clear(self):
+        super().clear()
+        self.sum_time_5 = self.sum_time_10 = self.sum_mem_5 = 0.0
 
 class EnhancedPerformanceMonitor:
     """Advanced performance monitoring with desktop integration"""
     
+    HISTORY_SIZE = 1000  # Entries kept in memory
+    COMPACT_THRESHOLD = 10000  # Lines in the metrics file before it is compacted
+    
     def __init__(self, config: DesktopConfig):
         self.config = config
-        self.metrics_file = config.data_dir / 'performance_metrics.json'
-        self.performance_history = []
+        self.metrics_file = config.data_dir / 'performance_metrics.jsonl'
+        self.performance_history = _RollingHistory(self.HISTORY_SIZE)
+        self._file_lines = 0
         self._load_history()
+        
+        # Append-only, buffered metrics log; flushed on close
+        self._metrics_fh = open(self.metrics_file, 'ab', buffering=64 * 1024)
+        atexit.register(self.close)
     
     def _load_history(self):
         """Load performance history"""
+        self._file_lines = 0
         try:
             if self.metrics_file.exists():
-                with open(self.metrics_file, 'r') as f:
-                    self.performance_history = json.load(f)
-                    # Keep only last 1000 entries
-                    self.performance_history = self.performance_history[-1000:]
+                with open(self.metrics_file, 'rb') as f:
+                    for line in f:
+                        self._file_lines += 1
+                        if line.strip():
+                            self.performance_history.append(_loads(line))
+            else:
+                self._migrate_legacy_history()
         except Exception as e:
             logger.warning(f"Failed to load performance history: {e}")
-            self.performance_history = []
+            self.performance_history.clear()
+            # Count what is actually on disk so compaction still triggers on time
+            self._file_lines = self._count_file_lines()
+    
+    def _count_file_lines(self) -> int:
+        """Lines currently in the metrics file, or 0 if it cannot be read"""
+        try:
+            with open(self.metrics_file, 'rb') as f:
+                return sum(1 for _ in f)
+        except OSError:
+            return 0
+    
+    def _migrate_legacy_history(self):
+        """Convert the pre-JSONL performance_metrics.json into the JSONL log"""
+        legacy_file = self.metrics_file.with_suffix('.json')
+        if legacy_file.exists():
+            with open(legacy_file, 'r') as f:
+                self.performance_history.extend(json.load(f))
+            self._rewrite_metrics_file()
+            legacy_file.unlink()
+    
+    def _rewrite_metrics_file(self):
+        """Rewrite the metrics file with only the in-memory history"""
+        tmp_file = self.metrics_file.with_suffix('.jsonl.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.writelines(_dumps(entry) + b'\n' for entry in self.performance_history)
+        os.replace(tmp_file, self.metrics_file)
+        self._file_lines = len(self.performance_history)
+    
+    def _recent(self, count: int) -> List[Dict[str, Any]]:
+        """Return the last count history entries"""
+        start = max(len(self.performance_history) - count, 0)
+        return list(itertools.islice(self.performance_history, start, None))
+    
+    def close(self):
+        """Flush and close the metrics log"""
+        if not self._metrics_fh.closed:
+            self._metrics_fh.close()
     
     def record_execution(self, result: DesktopExecutionResult, code: str, language: str):
         """Record execution performance"""
@@ -344,13 +738,17 @@ class EnhancedPerformanceMonitor:
             insights = self._analyze_performance(metric_entry)
             result.performance_metrics.update(insights)
             
-            # Save to file
-            with open(self.metrics_file, 'w') as f:
-                json.dump(self.performance_history[-1000:], f)
+            # Append to the metrics log, compacting it once it grows too long
+            self._metrics_fh.write(_dumps(metric_entry) + b'\n')
+            self._file_lines += 1
+            if self._file_lines > self.COMPACT_THRESHOLD:
+                self._metrics_fh.close()
+                self._rewrite_metrics_file()
+                self._metrics_fh = open(self.metrics_file, 'ab', buffering=64 * 1024)
             
             # Send notifications if enabled
-            if self.config.notifications['performance_insights'] and insights.get('significant_change'):
-                DesktopNotification.send(
+            if self.config.notify_perf and insights.get('significant_change'):
+                DesktopNotification.notify(
                     "Performance Insight",
                     insights.get('message', 'Performance pattern detected'),
                     "info"
@@ -361,14 +759,7 @@ class EnhancedPerformanceMonitor:
     
     def _calculate_complexity(self, code: str) -> int:
         """Simple code complexity calculation"""
-        # Basic cyclomatic complexity approximation
-        complexity_keywords = ['if', 'elif', 'else', 'for', 'while', 'try', 'except', 'finally', 'with']
-        complexity = 1  # Base complexity
-        
-        for keyword in complexity_keywords:
-            complexity += code.count(keyword)
-        
-        return complexity
+        return _code_complexity(code)
     
     def _analyze_performance(self, current_metric: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze performance trends"""
@@ -378,9 +769,8 @@ class EnhancedPerformanceMonitor:
             return insights
         
         # Recent history for comparison
-        recent = self.performance_history[-5:]
-        avg_time = sum(m['execution_time'] for m in recent) / len(recent)
-        avg_memory = sum(m['memory_usage'] for m in recent) / len(recent)
+        avg_time = self.performance_history.sum_time_5 / 5
+        avg_memory = self.performance_history.sum_mem_5 / 5
         
         current_time = current_metric['execution_time']
         current_memory = current_metric['memory_usage']
@@ -406,12 +796,8 @@ class EnhancedPerformanceMonitor:
         if len(self.performance_history) < 10:
             return "insufficient_data"
         
-        recent_10 = self.performance_history[-10:]
-        early_5 = recent_10[:5]
-        late_5 = recent_10[5:]
-        
-        early_avg = sum(m['execution_time'] for m in early_5) / 5
-        late_avg = sum(m['execution_time'] for m in late_5) / 5
+        early_avg = (self.performance_history.sum_time_10 - self.performance_history.sum_time_5) / 5
+        late_avg = self.performance_history.sum_time_5 / 5
         
         if late_avg < early_avg * 0.9:
             return "improving"
@@ -422,30 +808,184 @@ class EnhancedPerformanceMonitor:
 
 # ===== ENHANCED MCP SERVER =====
 
+# Static tool descriptors returned by tools/list
+MCP_TOOLS = [
+    {
+        "name": "execute_code",
+        "description": "Execute code with quantum debugging, security analysis, and performance monitoring",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "language": {
+                    "type": "string",
+                    "enum": ["python", "javascript", "bash", "slash"],
+                    "description": "Programming language or 'slash' for advanced commands"
+                },
+                "code": {
+                    "type": "string",
+                    "description": "Code to execute or slash command"
+                },
+                "security_level": {
+                    "type": "string",
+                    "enum": ["maximum", "balanced", "development"],
+                    "description": "Override default security level"
+                },
+                "enable_quantum": {
+                    "type": "boolean",
+                    "description": "Enable quantum debugging features"
+                }
+            },
+            "required": ["language", "code"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "quantum_debug",
+        "description": "Advanced quantum debugging with parallel algorithm testing",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "task_description": {
+                    "type": "string",
+                    "description": "Description of optimization task"
+                },
+                "test_data_size": {
+                    "type": "number",
+                    "description": "Size of test data"
+                },
+                "iterations": {
+                    "type": "number",
+                    "description": "Number of iterations"
+                }
+            },
+            "required": ["task_description"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "security_scan",
+        "description": "Comprehensive security analysis of code",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "code": {"type": "string"},
+                "language": {"type": "string"},
+                "scan_level": {
+                    "type": "string",
+                    "enum": ["basic", "comprehensive", "enterprise"]
+                }
+            },
+            "required": ["code", "language"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "performance_benchmark",
+        "description": "Statistical performance analysis",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "code": {"type": "string"},
+                "language": {"type": "string"},
+                "iterations": {"type": "number", "minimum": 1, "maximum": 1000}
+            },
+            "required": ["code", "language"],
+            "additionalProperties": False
+        }
+    },
+    {
+        "name": "system_diagnostics",
+        "description": "System health check and diagnostics",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "component": {
+                    "type": "string",
+                    "enum": ["all", "podman", "performance", "security", "storage"]
+                },
+                "detailed": {"type": "boolean"}
+            },
+            "required": ["component"],
+            "additionalProperties": False
+        }
+    }
+]
+
+TOOLS_LIST_RESULT = {"tools": MCP_TOOLS}
+
+INITIALIZE_RESULT = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {
+        "tools": {},
+        "prompts": {},
+        "resources": {}
+    },
+    "serverInfo": {
+        "name": "claude-jester-desktop",
+        "version": "3.1.0",
+        "description": "Claude-Jester Quantum Debugger Desktop Extension"
+    }
+}
+
+# Pre-serialised bodies of static results, keyed by the identity of the result object
+_STATIC_RESULT_JSON = {
+    id(TOOLS_LIST_RESULT): _dumps(TOOLS_LIST_RESULT),
+    id(INITIALIZE_RESULT): _dumps(INITIALIZE_RESULT),
+}
+
 class DesktopMCPServer:
     """Enhanced MCP server for desktop extension environment"""
     
+    SYSINFO_TTL = 1.0  # Seconds a psutil reading is reused by diagnostics
+    
     def __init__(self):
         self.config = DesktopConfig()
         self.audit_logger = DesktopAuditLogger(self.config)
         self.performance_monitor = EnhancedPerformanceMonitor(self.config)
         
         # Import enhanced components from standalone server
-        from standalone_mcp_server import PodmanCodeExecutor, IntegratedSlashCommands
+        from standalone_mcp_server import get_executor, IntegratedSlashCommands
         
-        self.podman_executor = PodmanCodeExecutor() if self.config.podman_enabled else None
-        self.slash_commands = IntegratedSlashCommands(self)
+        self.podman_executor = get_executor() if self.config.podman_enabled else None
+        self.slash_commands = IntegratedSlashCommands(self, self.podman_executor)
+        
+        # Artifact directory for the current day, created on first use
+        self._artifacts_day = None
+        self._artifacts_path = None
+        
+        # Worker threads for blocking tool work so the event loop stays responsive
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix='jester-tool')
+        self._sysinfo_cache = {}  # name -> (monotonic timestamp, psutil result)
+        
+        # JSON-RPC method and tool dispatch tables
+        self._method_handlers = {
+            "initialize": self.handle_initialize,
+            "tools/list": self.handle_list_tools,
+            "tools/call": self.handle_call_tool,
+            "notifications/initialized": self.handle_initialized,
+        }
+        self._tool_handlers = {
+            "execute_code": self._tool_execute_code,
+            "quantum_debug": self._tool_quantum_debug,
+            "security_scan": self._tool_security_scan,
+            "performance_benchmark": self._tool_performance_benchmark,
+            "system_diagnostics": self._tool_system_diagnostics,
+        }
         
         logger.info("Claude-Jester Desktop Extension Server initialized")
         
         # Send startup notification
-        if self.config.notifications['enabled']:
-            DesktopNotification.send(
+        if self.config.notify_enabled:
+            DesktopNotification.notify(
                 "Claude-Jester Started",
                 f"Quantum debugging platform ready (Security: {self.config.security_level})",
                 "info"
             )
     
+    def close(self):
+        """Release the tool worker threads"""
+        self._pool.shutdown(wait=False)
+    
     async def execute_code_enhanced(self, language: str, code: str, 
                                    security_level: Optional[str] = None,
                                    enable_quantum: Optional[bool] = None) -> DesktopExecutionResult:
@@ -469,8 +1009,8 @@ class DesktopMCPServer:
         security_analysis = self._analyze_code_security(code, language)
         
         # Send security alert if needed
-        if security_analysis.get('risk_level') == 'high' and self.config.notifications['security_alerts']:
-            DesktopNotification.send(
+        if security_analysis.get('risk_level') == 'high' and self.config.notify_security:
+            DesktopNotification.notify(
                 "Security Alert",
                 f"High-risk code patterns detected: {', '.join(security_analysis.get('issues', []))}",
                 "warning"
@@ -491,7 +1031,8 @@ class DesktopMCPServer:
                     security_level="command",
                     method="slash_command"
                 )
-            elif self.podman_executor and sec_level in ['maximum', 'balanced']:
+            elif (self.podman_executor and sec_level in ['maximum', 'balanced']
+                    and await self.podman_executor.is_available()):
                 # Use Podman execution
                 exec_result = await self.podman_executor.execute_code(code, language, sec_level)
                 result = DesktopExecutionResult(
@@ -506,7 +1047,7 @@ class DesktopMCPServer:
                 )
             else:
                 # Fallback to subprocess execution
-                output = self._execute_subprocess(code, language)
+                output = await self._execute_subprocess(code, language)
                 result = DesktopExecutionResult(
                     success="Error:" not in output,
                     output=output if "Error:" not in output else "",
@@ -546,168 +1087,125 @@ class DesktopMCPServer:
             error_result.security_analysis = security_analysis
             
             # Log error
-            logger.error(f"Code execution failed: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception(f"Code execution failed: {e}")
             
             return error_result
     
     def _analyze_code_security(self, code: str, language: str) -> Dict[str, Any]:
         """Enhanced security analysis"""
-        analysis = {
-            'risk_level': 'low',
-            'issues': [],
-            'recommendations': [],
-            'patterns_detected': []
+        risk_level, issues, recommendations, patterns_detected = _security_verdict(code)
+        
+        # Fresh containers each call; callers attach and extend the analysis
+        return {
+            'risk_level': risk_level,
+            'issues': list(issues),
+            'recommendations': list(recommendations),
+            'patterns_detected': list(patterns_detected)
         }
-        
-        # High-risk patterns
-        high_risk_patterns = [
-            ('os.system', 'System command execution'),
-            ('subprocess.call', 'Subprocess execution'),
-            ('eval(', 'Dynamic code evaluation'),
-            ('exec(', 'Dynamic code execution'),
-            ('__import__', 'Dynamic imports'),
-            ('open(', 'File access'),
-        ]
-        
-        # Medium-risk patterns
-        medium_risk_patterns = [
-            ('import os', 'Operating system access'),
-            ('import subprocess', 'Subprocess module'),
-            ('import socket', 'Network socket access'),
-            ('urllib', 'Network requests'),
-            ('requests', 'HTTP requests'),
-        ]
-        
-        # Check patterns
-        high_risk_found = []
-        medium_risk_found = []
-        
-        for pattern, description in high_risk_patterns:
-            if pattern in code:
-                high_risk_found.append(description)
-        
-        for pattern, description in medium_risk_patterns:
-            if pattern in code:
-                medium_risk_found.append(description)
-        
-        # Determine risk level
-        if high_risk_found:
-            analysis['risk_level'] = 'high'
-            analysis['issues'] = high_risk_found
-            analysis['recommendations'].append('Consider using containerized execution')
-        elif medium_risk_found:
-            analysis['risk_level'] = 'medium'
-            analysis['issues'] = medium_risk_found
-            analysis['recommendations'].append('Review network and file access patterns')
-        
-        analysis['patterns_detected'] = high_risk_found + medium_risk_found
-        
-        return analysis
     
-    def _execute_subprocess(self, code: str, language: str) -> str:
+    async def _execute_subprocess(self, code: str, language: str) -> str:
         """Fallback subprocess execution"""
         try:
             if language == 'python':
-                return self._execute_python_subprocess(code)
+                return await self._execute_python_subprocess(code)
             elif language in ['javascript', 'js']:
-                return self._execute_javascript_subprocess(code)
+                return await self._execute_javascript_subprocess(code)
             elif language == 'bash':
-                return self._execute_bash_subprocess(code)
+                return await self._execute_bash_subprocess(code)
             else:
                 return f"Error: Unsupported language {language}"
         except Exception as e:
             return f"Error: Subprocess execution failed: {str(e)}"
     
-    def _execute_python_subprocess(self, code: str) -> str:
+    async def _communicate(self, proc: asyncio.subprocess.Process, stdin: Optional[bytes] = None):
+        """Collect decoded output from proc, killing it on timeout"""
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(stdin), timeout=self.config.max_execution_time)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+        return stdout.decode(errors='replace'), stderr.decode(errors='replace')
+    
+    async def _execute_python_subprocess(self, code: str) -> str:
         """Python subprocess execution"""
         try:
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(code)
-                temp_file = f.name
+            # Source is piped to the interpreter on stdin; no temp file needed
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable, '-',
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=tempfile.gettempdir()
+            )
+            stdout, stderr = await self._communicate(proc, code.encode())
             
-            try:
-                result = subprocess.run(
-                    [sys.executable, temp_file],
-                    capture_output=True,
-                    text=True,
-                    timeout=self.config.max_execution_time,
-                    cwd=tempfile.gettempdir()
-                )
-                
-                output = ""
-                if result.stdout:
-                    output += f"Output:\n{result.stdout.strip()}"
-                if result.stderr:
-                    if output:
-                        output += f"\n\nErrors/Warnings:\n{result.stderr.strip()}"
-                    else:
-                        output += f"Errors:\n{result.stderr.strip()}"
-                
-                return output or "Code executed successfully (no output)"
-                
-            finally:
-                try:
-                    os.unlink(temp_file)
-                except:
-                    pass
-                    
-        except subprocess.TimeoutExpired:
+            output = ""
+            if stdout:
+                output += f"Output:\n{stdout.strip()}"
+            if stderr:
+                if output:
+                    output += f"\n\nErrors/Warnings:\n{stderr.strip()}"
+                else:
+                    output += f"Errors:\n{stderr.strip()}"
+            
+            return output or "Code executed successfully (no output)"
+            
+        except asyncio.TimeoutError:
             return f"Error: Code execution timed out ({self.config.max_execution_time} seconds)"
         except Exception as e:
             return f"Error executing Python code: {str(e)}"
     
-    def _execute_javascript_subprocess(self, code: str) -> str:
+    async def _execute_javascript_subprocess(self, code: str) -> str:
         """JavaScript subprocess execution"""
         try:
-            result = subprocess.run(
-                ["node", "-e", code],
-                capture_output=True,
-                text=True,
-                timeout=self.config.max_execution_time
+            proc = await asyncio.create_subprocess_exec(
+                "node", "-e", code,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
+            stdout, stderr = await self._communicate(proc)
             
             output = ""
-            if result.stdout:
-                output += f"Output:\n{result.stdout.strip()}"
-            if result.stderr:
+            if stdout:
+                output += f"Output:\n{stdout.strip()}"
+            if stderr:
                 if output:
-                    output += f"\n\nErrors:\n{result.stderr.strip()}"
+                    output += f"\n\nErrors:\n{stderr.strip()}"
                 else:
-                    output += f"Errors:\n{result.stderr.strip()}"
+                    output += f"Errors:\n{stderr.strip()}"
             
             return output or "Code executed successfully (no output)"
             
         except FileNotFoundError:
             return "Error: Node.js not found. Please install Node.js to run JavaScript code."
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             return f"Error: Code execution timed out ({self.config.max_execution_time} seconds)"
         except Exception as e:
             return f"Error executing JavaScript code: {str(e)}"
     
-    def _execute_bash_subprocess(self, code: str) -> str:
+    async def _execute_bash_subprocess(self, code: str) -> str:
         """Bash subprocess execution"""
         try:
-            result = subprocess.run(
+            proc = await asyncio.create_subprocess_shell(
                 code,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=self.config.max_execution_time
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
+            stdout, stderr = await self._communicate(proc)
             
             output = ""
-            if result.stdout:
-                output += f"Output:\n{result.stdout.strip()}"
-            if result.stderr:
+            if stdout:
+                output += f"Output:\n{stdout.strip()}"
+            if stderr:
                 if output:
-                    output += f"\n\nErrors:\n{result.stderr.strip()}"
+                    output += f"\n\nErrors:\n{stderr.strip()}"
                 else:
-                    output += f"Errors:\n{result.stderr.strip()}"
+                    output += f"Errors:\n{stderr.strip()}"
             
             return output or "Command executed successfully (no output)"
             
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             return f"Error: Command execution timed out ({self.config.max_execution_time} seconds)"
         except Exception as e:
             return f"Error executing bash command: {str(e)}"
@@ -715,10 +1213,7 @@ class DesktopMCPServer:
     async def _store_execution_artifact(self, result: DesktopExecutionResult, code: str, language: str):
         """Store execution artifacts for later analysis"""
         try:
-            artifacts_dir = self.config.workspace_dir / 'artifacts' / datetime.now().strftime('%Y%m%d')
-            artifacts_dir.mkdir(parents=True, exist_ok=True)
-            
-            artifact_file = artifacts_dir / f"{result.session_id}.json"
+            artifact_file = self._artifacts_dir(datetime.now().strftime('%Y%m%d')) / f"{result.session_id}.json"
             
             artifact_data = {
                 'session_id': result.session_id,
@@ -727,18 +1222,26 @@ class DesktopMCPServer:
                 'code': code,
                 'result': asdict(result),
                 'platform_info': {
-                    'system': platform.system(),
-                    'python_version': platform.python_version(),
-                    'processor': platform.processor()
+                    'system': _PLATFORM_INFO['system'],
+                    'python_version': _PLATFORM_INFO['python_version'],
+                    'processor': _PLATFORM_INFO['processor']
                 }
             }
             
-            async with aiofiles.open(artifact_file, 'w') as f:
-                await f.write(json.dumps(artifact_data, indent=2))
+            payload = _dumps(artifact_data)
+            await asyncio.get_running_loop().run_in_executor(None, artifact_file.write_bytes, payload)
             
         except Exception as e:
             logger.warning(f"Failed to store execution artifact: {e}")
     
+    def _artifacts_dir(self, day: str) -> Path:
+        """Return the artifact directory for day, creating it once per day"""
+        if day != self._artifacts_day:
+            self._artifacts_path = self.config.workspace_dir / 'artifacts' / day
+            self._artifacts_path.mkdir(parents=True, exist_ok=True)
+            self._artifacts_day = day
+        return self._artifacts_path
+    
     # ===== MCP PROTOCOL HANDLERS =====
     
     def handle_initialize(self, request):
@@ -751,19 +1254,7 @@ class DesktopMCPServer:
             response = {
                 "jsonrpc": "2.0",
                 "id": request_id,
-                "result": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {
-                        "tools": {},
-                        "prompts": {},
-                        "resources": {}
-                    },
-                    "serverInfo": {
-                        "name": "claude-jester-desktop",
-                        "version": "3.1.0",
-                        "description": "Claude-Jester Quantum Debugger Desktop Extension"
-                    }
-                }
+                "result": INITIALIZE_RESULT
             }
             
             logger.info("Initialize request handled successfully")
@@ -780,6 +1271,11 @@ class DesktopMCPServer:
                 }
             }
     
+    def handle_initialized(self, request):
+        """Handle notifications/initialized; notifications get no response"""
+        logger.info("Received initialized notification")
+        return None
+    
     def handle_list_tools(self, request):
         """Handle tools/list request"""
         logger.info("Handling list tools request")
@@ -787,114 +1283,10 @@ class DesktopMCPServer:
         try:
             request_id = request.get("id", 1)
             
-            tools = [
-                {
-                    "name": "execute_code",
-                    "description": "Execute code with quantum debugging, security analysis, and performance monitoring",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "language": {
-                                "type": "string",
-                                "enum": ["python", "javascript", "bash", "slash"],
-                                "description": "Programming language or 'slash' for advanced commands"
-                            },
-                            "code": {
-                                "type": "string",
-                                "description": "Code to execute or slash command"
-                            },
-                            "security_level": {
-                                "type": "string",
-                                "enum": ["maximum", "balanced", "development"],
-                                "description": "Override default security level"
-                            },
-                            "enable_quantum": {
-                                "type": "boolean",
-                                "description": "Enable quantum debugging features"
-                            }
-                        },
-                        "required": ["language", "code"],
-                        "additionalProperties": False
-                    }
-                },
-                {
-                    "name": "quantum_debug",
-                    "description": "Advanced quantum debugging with parallel algorithm testing",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "task_description": {
-                                "type": "string",
-                                "description": "Description of optimization task"
-                            },
-                            "test_data_size": {
-                                "type": "number",
-                                "description": "Size of test data"
-                            },
-                            "iterations": {
-                                "type": "number",
-                                "description": "Number of iterations"
-                            }
-                        },
-                        "required": ["task_description"],
-                        "additionalProperties": False
-                    }
-                },
-                {
-                    "name": "security_scan",
-                    "description": "Comprehensive security analysis of code",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "code": {"type": "string"},
-                            "language": {"type": "string"},
-                            "scan_level": {
-                                "type": "string",
-                                "enum": ["basic", "comprehensive", "enterprise"]
-                            }
-                        },
-                        "required": ["code", "language"],
-                        "additionalProperties": False
-                    }
-                },
-                {
-                    "name": "performance_benchmark",
-                    "description": "Statistical performance analysis",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "code": {"type": "string"},
-                            "language": {"type": "string"},
-                            "iterations": {"type": "number", "minimum": 1, "maximum": 1000}
-                        },
-                        "required": ["code", "language"],
-                        "additionalProperties": False
-                    }
-                },
-                {
-                    "name": "system_diagnostics",
-                    "description": "System health check and diagnostics",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "component": {
-                                "type": "string",
-                                "enum": ["all", "podman", "performance", "security", "storage"]
-                            },
-                            "detailed": {"type": "boolean"}
-                        },
-                        "required": ["component"],
-                        "additionalProperties": False
-                    }
-                }
-            ]
-            
             response = {
                 "jsonrpc": "2.0",
                 "id": request_id,
-                "result": {
-                    "tools": tools
-                }
+                "result": TOOLS_LIST_RESULT
             }
             
             logger.info("List tools request handled successfully")
@@ -926,41 +1318,9 @@ class DesktopMCPServer:
             
             logger.debug(f"Tool: {tool_name}, Arguments: {arguments}")
             
-            if tool_name == "execute_code":
-                language = arguments.get("language", "").lower()
-                code = arguments.get("code", "")
-                security_level = arguments.get("security_level")
-                enable_quantum = arguments.get("enable_quantum")
-                
-                if not code.strip():
-                    result_text = "Error: No code provided"
-                else:
-                    exec_result = await self.execute_code_enhanced(
-                        language, code, security_level, enable_quantum
-                    )
-                    result_text = self._format_execution_result(exec_result)
-                    
-            elif tool_name == "quantum_debug":
-                task = arguments.get("task_description", "")
-                result_text = await self._handle_quantum_debug(task, arguments)
-                
-            elif tool_name == "security_scan":
-                code = arguments.get("code", "")
-                language = arguments.get("language", "")
-                scan_level = arguments.get("scan_level", "basic")
-                result_text = self._handle_security_scan(code, language, scan_level)
-                
-            elif tool_name == "performance_benchmark":
-                code = arguments.get("code", "")
-                language = arguments.get("language", "")
-                iterations = arguments.get("iterations", 10)
-                result_text = await self._handle_performance_benchmark(code, language, iterations)
-                
-            elif tool_name == "system_diagnostics":
-                component = arguments.get("component", "all")
-                detailed = arguments.get("detailed", False)
-                result_text = await self._handle_system_diagnostics(component, detailed)
-                
+            handler = self._tool_handlers.get(tool_name)
+            if handler:
+                result_text = await handler(arguments)
             else:
                 result_text = f"Unknown tool: {tool_name}"
             
@@ -982,8 +1342,7 @@ class DesktopMCPServer:
             
         except Exception as e:
             error_msg = f"Internal error: {str(e)}"
-            logger.error(error_msg)
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception(error_msg)
             return {
                 "jsonrpc": "2.0",
                 "id": request.get("id", 1),
@@ -993,52 +1352,96 @@ class DesktopMCPServer:
                 }
             }
     
+    async def _tool_execute_code(self, arguments: Dict[str, Any]) -> str:
+        """execute_code tool"""
+        language = arguments.get("language", "").lower()
+        code = arguments.get("code", "")
+        security_level = arguments.get("security_level")
+        enable_quantum = arguments.get("enable_quantum")
+        
+        if not code.strip():
+            return "Error: No code provided"
+        
+        exec_result = await self.execute_code_enhanced(
+            language, code, security_level, enable_quantum
+        )
+        return self._format_execution_result(exec_result)
+    
+    async def _tool_quantum_debug(self, arguments: Dict[str, Any]) -> str:
+        """quantum_debug tool"""
+        task = arguments.get("task_description", "")
+        return await self._handle_quantum_debug(task, arguments)
+    
+    async def _tool_security_scan(self, arguments: Dict[str, Any]) -> str:
+        """security_scan tool"""
+        code = arguments.get("code", "")
+        language = arguments.get("language", "")
+        scan_level = arguments.get("scan_level", "basic")
+        return await asyncio.get_running_loop().run_in_executor(
+            self._pool, self._handle_security_scan, code, language, scan_level
+        )
+    
+    async def _tool_performance_benchmark(self, arguments: Dict[str, Any]) -> str:
+        """performance_benchmark tool"""
+        code = arguments.get("code", "")
+        language = arguments.get("language", "")
+        iterations = arguments.get("iterations", 10)
+        return await self._handle_performance_benchmark(code, language, iterations)
+    
+    async def _tool_system_diagnostics(self, arguments: Dict[str, Any]) -> str:
+        """system_diagnostics tool"""
+        component = arguments.get("component", "all")
+        detailed = arguments.get("detailed", False)
+        return await self._handle_system_diagnostics(component, detailed)
+    
     def _format_execution_result(self, result: DesktopExecutionResult) -> str:
         """Format execution result for display"""
         status_emoji = "✅" if result.success else "❌"
         
-        output = f"🃏 **Claude-Jester Desktop Execution Result:**\n\n"
-        output += f"**Status:** {status_emoji} {'Success' if result.success else 'Failed'}\n"
-        output += f"**Security Level:** {result.security_level}\n"
-        output += f"**Method:** {result.method}\n"
-        output += f"**Execution Time:** {result.execution_time:.3f}s\n"
-        output += f"**Memory Usage:** {result.memory_usage}MB\n"
+        parts = [f"🃏 **Claude-Jester Desktop Execution Result:**\n\n"]
+        append = parts.append
+        
+        append(f"**Status:** {status_emoji} {'Success' if result.success else 'Failed'}\n")
+        append(f"**Security Level:** {result.security_level}\n")
+        append(f"**Method:** {result.method}\n")
+        append(f"**Execution Time:** {result.execution_time:.3f}s\n")
+        append(f"**Memory Usage:** {result.memory_usage}MB\n")
         
         if result.container_id:
-            output += f"**Container:** {result.container_id}\n"
+            append(f"**Container:** {result.container_id}\n")
         
         # Security analysis
         if result.security_analysis:
             risk_level = result.security_analysis.get('risk_level', 'unknown')
-            risk_emoji = {"low": "🟢", "medium": "🟡", "high": "🔴"}.get(risk_level, "⚪")
-            output += f"**Security Risk:** {risk_emoji} {risk_level.upper()}\n"
+            risk_emoji = RISK_EMOJI.get(risk_level, "⚪")
+            append(f"**Security Risk:** {risk_emoji} {risk_level.upper()}\n")
             
             if result.security_analysis.get('issues'):
-                output += f"**Security Issues:** {', '.join(result.security_analysis['issues'])}\n"
+                append(f"**Security Issues:** {', '.join(result.security_analysis['issues'])}\n")
         
         # Performance insights
         if result.performance_metrics:
             if result.performance_metrics.get('significant_change'):
-                output += f"**Performance Alert:** {result.performance_metrics.get('message', 'Change detected')}\n"
+                append(f"**Performance Alert:** {result.performance_metrics.get('message', 'Change detected')}\n")
             
             trend = result.performance_metrics.get('performance_trend')
             if trend:
-                trend_emoji = {"improving": "📈", "degrading": "📉", "stable": "➡️"}.get(trend, "")
-                output += f"**Performance Trend:** {trend_emoji} {trend.title()}\n"
+                trend_emoji = TREND_EMOJI.get(trend, "")
+                append(f"**Performance Trend:** {trend_emoji} {trend.title()}\n")
         
-        output += "\n"
+        append("\n")
         
         if result.output:
-            output += f"**Output:**\n```\n{result.output}\n```\n"
+            append(f"**Output:**\n```\n{result.output}\n```\n")
         
         if result.error:
-            output += f"**Errors:**\n```\n{result.error}\n```\n"
+            append(f"**Errors:**\n```\n{result.error}\n```\n")
         
         # Session info
-        output += f"\n**Session ID:** `{result.session_id}`\n"
-        output += f"**Timestamp:** {result.timestamp}\n"
+        append(f"\n**Session ID:** `{result.session_id}`\n")
+        append(f"**Timestamp:** {result.timestamp}\n")
         
-        return output
+        return "".join(parts)
     
     async def _handle_quantum_debug(self, task: str, arguments: Dict[str, Any]) -> str:
         """Handle quantum debugging request"""
@@ -1050,8 +1453,8 @@ class DesktopMCPServer:
         result = await self.slash_commands.process_command(quantum_command)
         
         # Send notification if enabled
-        if self.config.notifications['quantum_results']:
-            DesktopNotification.send(
+        if self.config.notify_quantum:
+            DesktopNotification.notify(
                 "Quantum Debugging Complete",
                 f"Task: {task[:50]}...",
                 "info"
@@ -1063,32 +1466,34 @@ class DesktopMCPServer:
         """Handle security scan request"""
         analysis = self._analyze_code_security(code, language)
         
-        output = f"🛡️ **Security Analysis Report**\n\n"
-        output += f"**Language:** {language}\n"
-        output += f"**Scan Level:** {scan_level}\n"
+        parts = [f"🛡️ **Security Analysis Report**\n\n"]
+        append = parts.append
+        
+        append(f"**Language:** {language}\n")
+        append(f"**Scan Level:** {scan_level}\n")
         
         risk_level = analysis.get('risk_level', 'unknown')
-        risk_emoji = {"low": "🟢", "medium": "🟡", "high": "🔴"}.get(risk_level, "⚪")
-        output += f"**Risk Level:** {risk_emoji} {risk_level.upper()}\n\n"
+        risk_emoji = RISK_EMOJI.get(risk_level, "⚪")
+        append(f"**Risk Level:** {risk_emoji} {risk_level.upper()}\n\n")
         
         if analysis.get('issues'):
-            output += f"**Security Issues Found:**\n"
+            append(f"**Security Issues Found:**\n")
             for issue in analysis['issues']:
-                output += f"  - {issue}\n"
-            output += "\n"
+                append(f"  - {issue}\n")
+            append("\n")
         
         if analysis.get('recommendations'):
-            output += f"**Recommendations:**\n"
+            append(f"**Recommendations:**\n")
             for rec in analysis['recommendations']:
-                output += f"  - {rec}\n"
-            output += "\n"
+                append(f"  - {rec}\n")
+            append("\n")
         
         if analysis.get('patterns_detected'):
-            output += f"**Patterns Detected:**\n"
+            append(f"**Patterns Detected:**\n")
             for pattern in analysis['patterns_detected']:
-                output += f"  - {pattern}\n"
+                append(f"  - {pattern}\n")
         
-        return output
+        return "".join(parts)
     
     async def _handle_performance_benchmark(self, code: str, language: str, iterations: int) -> str:
         """Handle performance benchmark request"""
@@ -1101,77 +1506,265 @@ class DesktopMCPServer:
         
         return result
     
+    async def _sysinfo(self, name: str, query, *args):
+        """Run a psutil query on the pool, reusing its result for SYSINFO_TTL seconds"""
+        now = time.monotonic()
+        cached = self._sysinfo_cache.get(name)
+        if cached and now - cached[0] < self.SYSINFO_TTL:
+            return cached[1]
+        
+        value = await asyncio.get_running_loop().run_in_executor(self._pool, query, *args)
+        self._sysinfo_cache[name] = (now, value)
+        return value
+    
     async def _handle_system_diagnostics(self, component: str, detailed: bool) -> str:
         """Handle system diagnostics request"""
-        output = f"🔧 **System Diagnostics Report**\n\n"
+        import psutil
+        
+        parts = [f"🔧 **System Diagnostics Report**\n\n"]
+        append = parts.append
         
         if component in ["all", "system"]:
-            output += f"**System Information:**\n"
-            output += f"  - Platform: {platform.system()} {platform.release()}\n"
-            output += f"  - Python: {platform.python_version()}\n"
-            output += f"  - Architecture: {platform.architecture()[0]}\n"
-            output += f"  - Processor: {platform.processor()}\n"
+            append(_PLATFORM_SECTION)
             
             # Memory info
-            memory = psutil.virtual_memory()
-            output += f"  - Total Memory: {memory.total // (1024**3)}GB\n"
-            output += f"  - Available Memory: {memory.available // (1024**3)}GB\n"
-            output += f"  - Memory Usage: {memory.percent}%\n\n"
+            memory = await self._sysinfo('memory', psutil.virtual_memory)
+            append(f"  - Total Memory: {memory.total // (1024**3)}GB\n")
+            append(f"  - Available Memory: {memory.available // (1024**3)}GB\n")
+            append(f"  - Memory Usage: {memory.percent}%\n\n")
         
         if component in ["all", "podman"]:
-            output += f"**Podman Status:**\n"
+            append(f"**Podman Status:**\n")
             if self.podman_executor:
                 podman_info = await self.podman_executor.get_system_info()
                 if podman_info.get("status") == "available":
-                    output += f"  - Status: ✅ Available\n"
+                    append(f"  - Status: ✅ Available\n")
                     if detailed and podman_info.get("version"):
                         version_info = podman_info["version"]
-                        output += f"  - Version: {version_info.get('Version', 'Unknown')}\n"
-                        output += f"  - API Version: {version_info.get('APIVersion', 'Unknown')}\n"
+                        append(f"  - Version: {version_info.get('Version', 'Unknown')}\n")
+                        append(f"  - API Version: {version_info.get('APIVersion', 'Unknown')}\n")
                 else:
-                    output += f"  - Status: ❌ Not Available\n"
-                    output += f"  - Reason: {podman_info.get('reason', 'Unknown')}\n"
+                    append(f"  - Status: ❌ Not Available\n")
+                    append(f"  - Reason: {podman_info.get('reason', 'Unknown')}\n")
             else:
-                output += f"  - Status: ⚠️ Disabled in configuration\n"
-            output += "\n"
+                append(f"  - Status: ⚠️ Disabled in configuration\n")
+            append("\n")
         
         if component in ["all", "performance"]:
-            output += f"**Performance Monitoring:**\n"
-            output += f"  - Enabled: {'✅' if self.config.performance_monitoring else '❌'}\n"
+            append(f"**Performance Monitoring:**\n")
+            append(f"  - Enabled: {'✅' if self.config.performance_monitoring else '❌'}\n")
             
             if self.config.performance_monitoring and hasattr(self, 'performance_monitor'):
                 history_count = len(self.performance_monitor.performance_history)
-                output += f"  - History Records: {history_count}\n"
+                append(f"  - History Records: {history_count}\n")
                 
                 if history_count > 0:
-                    recent = self.performance_monitor.performance_history[-10:]
+                    recent = self.performance_monitor._recent(10)
                     avg_time = sum(r['execution_time'] for r in recent) / len(recent)
-                    output += f"  - Average Execution Time (last 10): {avg_time:.3f}s\n"
-            output += "\n"
+                    append(f"  - Average Execution Time (last 10): {avg_time:.3f}s\n")
+            append("\n")
         
         if component in ["all", "security"]:
-            output += f"**Security Configuration:**\n"
-            output += f"  - Default Security Level: {self.config.security_level}\n"
-            output += f"  - Allowed Languages: {', '.join(self.config.allowed_languages)}\n"
-            output += f"  - Enterprise Mode: {'✅' if self.config.enterprise_mode else '❌'}\n"
-            output += f"  - Audit Logging: {'✅' if self.config.enterprise_mode else '❌'}\n"
-            output += "\n"
+            append(f"**Security Configuration:**\n")
+            append(f"  - Default Security Level: {self.config.security_level}\n")
+            append(f"  - Allowed Languages: {', '.join(self.config.allowed_languages)}\n")
+            append(f"  - Enterprise Mode: {'✅' if self.config.enterprise_mode else '❌'}\n")
+            append(f"  - Audit Logging: {'✅' if self.config.enterprise_mode else '❌'}\n")
+            append("\n")
         
         if component in ["all", "storage"]:
-            output += f"**Storage Information:**\n"
-            output += f"  - Config Directory: {self.config.config_dir}\n"
-            output += f"  - Data Directory: {self.config.data_dir}\n"
-            output += f"  - Workspace Directory: {self.config.workspace_dir}\n"
+            append(f"**Storage Information:**\n")
+            append(f"  - Config Directory: {self.config.config_dir}\n")
+            append(f"  - Data Directory: {self.config.data_dir}\n")
+            append(f"  - Workspace Directory: {self.config.workspace_dir}\n")
             
             # Storage usage
             try:
-                usage = psutil.disk_usage(str(self.config.data_dir))
-                output += f"  - Disk Free: {usage.free // (1024**3)}GB\n"
-                output += f"  - Disk Usage: {(usage.used / usage.total) * 100:.1f}%\n"
+                usage = await self._sysinfo('disk', psutil.disk_usage, str(self.config.data_dir))
+                append(f"  - Disk Free: {usage.free // (1024**3)}GB\n")
+                append(f"  - Disk Usage: {(usage.used / usage.total) * 100:.1f}%\n")
             except:
                 pass
         
-        return output
+        return "".join(parts)
+
+def _dispatch(server: DesktopMCPServer, request: Dict[str, Any]):
+    """Route one JSON-RPC request; tools/call returns a coroutine for the caller to run"""
+    method = request.get("method")
+    
+    handler = server._method_handlers.get(method)
+    if handler:
+        return handler(request)
+    else:
+        logger.warning(f"Unknown method: {method}")
+        return {
+            "jsonrpc": "2.0",
+            "id": request.get("id", 1),
+            "error": {
+                "code": -32601,
+                "message": f"Method not found: {method}"
+            }
+        }
+
+async def _handle_batch(server: DesktopMCPServer, requests: List[Any]) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
+    """Handle a JSON-RPC batch, running its tool calls concurrently"""
+    if not requests:
+        return {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid Request: empty batch"}}
+    
+    responses = []
+    for request in requests:
+        if isinstance(request, dict):
+            responses.append(_dispatch(server, request))
+        else:
+            responses.append({"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid Request"}})
+    
+    pending = [i for i, response in enumerate(responses) if asyncio.iscoroutine(response)]
+    if pending:
+        results = await asyncio.gather(*(responses[i] for i in pending), return_exceptions=True)
+        for i, response in zip(pending, results):
+            if isinstance(response, Exception):
+                response = {
+                    "jsonrpc": "2.0",
+                    "id": requests[i].get("id"),
+                    "error": {"code": -32603, "message": f"Internal error: {str(response)}"}
+                }
+            responses[i] = response
+    
+    # Notifications (requests without an id) get no entry in the batch response
+    return [
+        response for request, response in zip(requests, responses)
+        if response is not None and not (isinstance(request, dict) and "id" not in request)
+    ] or None
+
+def _encode_response(response) -> bytes:
+    """Serialise a response, splicing in pre-serialised static results"""
+    if isinstance(response, list):
+        return b"[" + b",".join(map(_encode_response, response)) + b"]"
+    
+    cached = _STATIC_RESULT_JSON.get(id(response.get("result")))
+    if cached is not None and len(response) == 3:
+        return b'{"jsonrpc":"2.0","id":' + _dumps(response["id"]) + b',"result":' + cached + b"}"
+    return _dumps(response)
+
+def _write_response(out: io.BufferedWriter, response):
+    """Queue one JSON-RPC response line on out; the caller flushes"""
+    out.write(_encode_response(response))
+    out.write(b"\n")
+
+async def main_async():
+    """Serve JSON-RPC requests from stdin on a single long-lived event loop"""
+    server = DesktopMCPServer()
+    loop = asyncio.get_running_loop()
+    
+    # Responses are buffered and flushed once per input line (a request or a whole batch)
+    # (sys.stdout.buffer is already the raw FileIO when Python runs unbuffered)
+    out = io.BufferedWriter(getattr(sys.stdout.buffer, 'raw', sys.stdout.buffer), buffer_size=64 * 1024)
+    
+    # Pull images and start warm containers up front so no execution waits on either
+    prepull = None
+    if server.podman_executor:
+        prepull = loop.create_task(server.podman_executor.warm_up())
+    
+    try:
+        await _serve(server, loop, out)
+    finally:
+        if prepull:
+            prepull.cancel()
+        if server.podman_executor:
+            # Stop warm containers and wait for pending one-shot removals before the loop closes
+            try:
+                await server.podman_executor.cleanup_session()
+            except Exception as e:
+                logger.warning(f"Container cleanup failed: {e}")
+        server.close()
+
+async def _serve(server: DesktopMCPServer, loop: asyncio.AbstractEventLoop, out: io.BufferedWriter):
+    """Read requests until stdin closes, handling each line concurrently"""
+    # Raw bytes go straight to the JSON parser; no text decoding layer
+    stdin = io.BufferedReader(getattr(sys.stdin.buffer, 'raw', sys.stdin.buffer), buffer_size=64 * 1024)
+    line_count = 0
+    in_flight = set()
+    
+    while True:
+        # Read stdin off the loop so notifications and other tasks keep running
+        line = await loop.run_in_executor(None, stdin.readline)
+        if not line:
+            break
+        
+        line_count += 1
+        line = line.strip()
+        
+        if not line:
+            logger.debug(f"Skipping empty line {line_count}")
+            continue
+        
+        # A slow tool call no longer holds up the requests behind it
+        task = loop.create_task(_process_line(server, line, line_count, out))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    
+    # Let requests still running answer before shutting down
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+async def _process_line(server: DesktopMCPServer, line: bytes, line_count: int, out: io.BufferedWriter):
+    """Parse, dispatch and answer one input line"""
+    # Each response is written and flushed without an await in between, so
+    # concurrent tasks never interleave their output on the shared writer
+    logger.debug(f"Processing line {line_count}: {line[:100]!r}...")
+    
+    try:
+        request = _loads(line)
+        
+        if isinstance(request, list):
+            logger.debug(f"Parsed JSON-RPC batch of {len(request)} requests")
+            method = "batch"
+            response = await _handle_batch(server, request)
+        else:
+            logger.debug(f"Parsed JSON request: {request.get('method', 'unknown')}")
+            method = request.get("method")
+            response = _dispatch(server, request)
+            if asyncio.iscoroutine(response):
+                # Handle async call
+                response = await response
+        
+        if response:
+            _write_response(out, response)
+            logger.debug(f"Sent response for {method}")
+            
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON decode error on line {line_count}: {e}")
+        logger.error(f"Problematic line: {line!r}")
+        try:
+            error_response = {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {
+                    "code": -32700,
+                    "message": f"Parse error: {str(e)}"
+                }
+            }
+            _write_response(out, error_response)
+        except:
+            pass
+            
+    except Exception as e:
+        logger.exception(f"Request handling error on line {line_count}: {e}")
+        try:
+            error_response = {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {
+                    "code": -32603,
+                    "message": f"Internal error: {str(e)}"
+                }
+            }
+            _write_response(out, error_response)
+        except:
+            pass
+    
+    finally:
+        out.flush()
 
 def main():
     """Main entry point for desktop extension server"""
@@ -1180,91 +1773,13 @@ def main():
     logger.info(f"Python: {platform.python_version()}")
     logger.info(f"Mode: Desktop Extension")
     
-    server = DesktopMCPServer()
-    
     try:
-        line_count = 0
-        
-        for line in sys.stdin:
-            line_count += 1
-            line = line.strip()
-            
-            if not line:
-                logger.debug(f"Skipping empty line {line_count}")
-                continue
-            
-            logger.debug(f"Processing line {line_count}: {line[:100]}...")
-            
-            try:
-                request = json.loads(line)
-                logger.debug(f"Parsed JSON request: {request.get('method', 'unknown')}")
-                
-                response = None
-                method = request.get("method")
-                
-                if method == "initialize":
-                    response = server.handle_initialize(request)
-                elif method == "tools/list":
-                    response = server.handle_list_tools(request)
-                elif method == "tools/call":
-                    # Handle async call
-                    response = asyncio.run(server.handle_call_tool(request))
-                elif method == "notifications/initialized":
-                    logger.info("Received initialized notification")
-                    continue
-                else:
-                    logger.warning(f"Unknown method: {method}")
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": request.get("id", 1),
-                        "error": {
-                            "code": -32601,
-                            "message": f"Method not found: {method}"
-                        }
-                    }
-                
-                if response:
-                    response_json = json.dumps(response)
-                    print(response_json, flush=True)
-                    logger.debug(f"Sent response for {method}")
-                    
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON decode error on line {line_count}: {e}")
-                logger.error(f"Problematic line: {line}")
-                try:
-                    error_response = {
-                        "jsonrpc": "2.0",
-                        "id": None,
-                        "error": {
-                            "code": -32700,
-                            "message": f"Parse error: {str(e)}"
-                        }
-                    }
-                    print(json.dumps(error_response), flush=True)
-                except:
-                    pass
-                    
-            except Exception as e:
-                logger.error(f"Request handling error on line {line_count}: {e}")
-                logger.error(f"Traceback: {traceback.format_exc()}")
-                try:
-                    error_response = {
-                        "jsonrpc": "2.0",
-                        "id": None,
-                        "error": {
-                            "code": -32603,
-                            "message": f"Internal error: {str(e)}"
-                        }
-                    }
-                    print(json.dumps(error_response), flush=True)
-                except:
-                    pass
+        asyncio.run(main_async())
                 
     except KeyboardInterrupt:
         logger.info("Server stopped by keyboard interrupt")
     except Exception as e:
-        logger.error(f"Server error: {e}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception(f"Server error: {e}")
     finally:
         logger.info("Claude-Jester Desktop Extension Server shutting down")
         
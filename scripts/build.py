@@ -4,40 +4,378 @@ Claude-Jester Desktop Extension Production Builder
 Creates a production-ready .dxt package with all dependencies and optimizations
 """
 
+import io
 import os
+import re
 import sys
 import json
+import copy
 import shutil
+import zlib
 import zipfile
 import subprocess
 import tempfile
 import hashlib
+import fnmatch
 import platform
 from pathlib import Path
 from datetime import datetime
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Prefer orjson for manifest and package metadata, falling back to stdlib json
+try:
+    import orjson
+    
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, indent=2)
+    
+    _loads = json.loads
+
+# Fast content IDs for internal build caches; published checksums stay SHA256
+try:
+    from blake3 import blake3 as _fast_hash
+except ImportError:
+    try:
+        import xxhash
+        _fast_hash = xxhash.xxh3_128
+    except ImportError:
+        def _fast_hash():
+            return hashlib.blake2b(digest_size=16)
+
+# Files and directories stripped from bundled dependencies
+CLEANUP_PATTERNS = [
+    "*.pyc", "*.pyo", "__pycache__",
+    "*.dist-info", "*.egg-info",
+    "tests", "test", "testing",
+    "docs", "doc", "examples",
+    "*.md", "*.rst", "*.txt",
+    ".git*", ".tox", ".pytest_cache"
+]
+_CLEANUP_RE = re.compile("|".join(fnmatch.translate(p) for p in CLEANUP_PATTERNS))
+
+# Source fingerprints persisted in the build directory by --incremental builds
+FILE_HASHES_NAME = ".file_hashes.json"
+
+# Lines that are a print() call mentioning "debug", stripped from server files
+_DEBUG_PRINT_RE = re.compile(r'(?m)^[ \t]*print\([^\n]*(?i:debug)[^\n]*(?:\n|\Z)')
+
+# Already-compressed or binary files that are stored rather than deflated
+INCOMPRESSIBLE_SUFFIXES = {
+    ".so", ".pyd", ".dll", ".dylib", ".whl",
+    ".png", ".jpg", ".jpeg", ".gz", ".zip"
+}
+
+# Installation helper templates, filled in with str.format()
+INSTALL_WINDOWS_TEMPLATE = '''# Claude-Jester Desktop Extension Installer
+# Run this script to install the extension automatically
+
+Write-Host "🃏 Claude-Jester Desktop Extension Installer" -ForegroundColor Cyan
+Write-Host "Package: {package_name}" -ForegroundColor Green
+
+$claudeConfigPath = "$env:APPDATA\\Claude\\claude_desktop_config.json"
+$extensionPath = ".\\{package_name}"
+
+if (-not (Test-Path $extensionPath)) {{
+    Write-Host "❌ Extension package not found: $extensionPath" -ForegroundColor Red
+    exit 1
+}}
+
+Write-Host "📁 Found Claude Desktop config: $claudeConfigPath" -ForegroundColor Green
+Write-Host "📦 Installing extension..." -ForegroundColor Yellow
+
+# Launch Claude Desktop with extension
+Start-Process "claude://install-extension?path=$((Resolve-Path $extensionPath).Path)"
+
+Write-Host "✅ Installation initiated. Check Claude Desktop for completion." -ForegroundColor Green
+Write-Host "🔧 Configure the extension in Settings > Extensions" -ForegroundColor Yellow
+'''
+
+INSTALL_UNIX_TEMPLATE = '''#!/bin/bash
+# Claude-Jester Desktop Extension Installer
+
+echo "🃏 Claude-Jester Desktop Extension Installer"
+echo "Package: {package_name}"
+
+CLAUDE_CONFIG="$HOME/Library/Application Support/Claude/claude_desktop_config.json"
+if [[ "$OSTYPE" == "linux-gnu"* ]]; then
+    CLAUDE_CONFIG="$HOME/.config/claude/claude_desktop_config.json"
+fi
+
+EXTENSION_PATH="./{package_name}"
+
+if [ ! -f "$EXTENSION_PATH" ]; then
+    echo "❌ Extension package not found: $EXTENSION_PATH"
+    exit 1
+fi
+
+echo "📁 Claude Desktop config: $CLAUDE_CONFIG"
+echo "📦 Installing extension..."
+
+# Launch Claude Desktop with extension
+if [[ "$OSTYPE" == "darwin"* ]]; then
+    open "claude://install-extension?path=$(realpath "$EXTENSION_PATH")"
+else
+    xdg-open "claude://install-extension?path=$(realpath "$EXTENSION_PATH")"
+fi
+
+echo "✅ Installation initiated. Check Claude Desktop for completion."
+echo "🔧 Configure the extension in Settings > Extensions"
+'''
+
+INSTALL_README_TEMPLATE = '''# Claude-Jester Desktop Extension Installation
+
+## Automatic Installation
+
+### Windows
+1. Download `{package_name}` and `installation/install-windows.ps1`
+2. Place both files in the same directory
+3. Right-click `install-windows.ps1` and select "Run with PowerShell"
+4. Follow the prompts in Claude Desktop
+
+### macOS/Linux
+1. Download `{package_name}` and `installation/install-unix.sh`
+2. Place both files in the same directory
+3. Run: `./installation/install-unix.sh`
+4. Follow the prompts in Claude Desktop
+
+## Manual Installation
+
+1. Open Claude Desktop
+2. Go to Settings > Extensions
+3. Drag and drop `{package_name}` into the Extensions panel
+4. Configure extension preferences
+5. Start using quantum debugging features!
+
+## Package Information
+
+- **Version**: {version}
+- **Size**: {size_mb} MB
+- **SHA256**: `{sha256}`
+- **Build**: {build_time}
+
+## Support
+
+- Documentation: https://claude-jester.dev
+- Issues: https://github.com/mstanton/claude-jester/issues
+- Security: security@claude-jester.dev
+'''
+
+class _HashingWriter:
+    """Write-only stream wrapper that hashes every byte written through it.
+
+    It reports itself as unseekable, so zipfile streams each member with a
+    data descriptor instead of seeking back to patch local headers. That
+    keeps the running digest identical to the bytes that end up on disk.
+    """
+    
+    def __init__(self, fp, algorithm: str = "sha256"):
+        self._fp = fp
+        self._position = 0
+        self.hash = hashlib.new(algorithm)
+    
+    def write(self, data) -> int:
+        self.hash.update(data)
+        self._position += len(data)
+        return self._fp.write(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def flush(self):
+        self._fp.flush()
+
+_print_lock = threading.Lock()
+
+def _print(*args, **kwargs):
+    """print() that keeps lines whole when build stages run concurrently"""
+    with _print_lock:
+        print(*args, **kwargs)
+
+class ValidationAccumulator:
+    """Package facts gathered while members are written, for validate_package"""
+    
+    REQUIRED_FILES = ["manifest.json", "server/claude_jester_desktop.py"]
+    UNNECESSARY_PATTERNS = ['.pyc', '__pycache__', '.git', '.DS_Store']
+    _UNNECESSARY_RE = re.compile("|".join(map(re.escape, UNNECESSARY_PATTERNS)))
+    
+    def __init__(self):
+        self.required_seen = set()
+        self.total_size = 0
+        self.py_count = 0
+        self.unnecessary_count = 0
+        self.manifest_bytes = None
+    
+    def add(self, arc_name: str, file_size: int):
+        """Record one member of the package"""
+        self.total_size += file_size
+        if arc_name in self.REQUIRED_FILES:
+            self.required_seen.add(arc_name)
+        if arc_name.endswith('.py'):
+            self.py_count += 1
+        if self._UNNECESSARY_RE.search(arc_name):
+            self.unnecessary_count += 1
+    
+    @classmethod
+    def from_zip(cls, zf: zipfile.ZipFile) -> "ValidationAccumulator":
+        """Build the accumulator from an existing package"""
+        accumulator = cls()
+        manifest_info = None
+        for zinfo in zf.infolist():
+            accumulator.add(zinfo.filename, zinfo.file_size)
+            if zinfo.filename == "manifest.json":
+                manifest_info = zinfo
+        if manifest_info is not None:
+            accumulator.manifest_bytes = zf.read(manifest_info)
+        return accumulator
+
+def _compress_member(file_path: Path, arc_name: str, compresslevel: int):
+    """Read and deflate one package member; runs on a worker thread"""
+    zinfo = zipfile.ZipInfo.from_file(file_path, arc_name)
+    data = file_path.read_bytes()
+    zinfo.file_size = len(data)
+    zinfo.CRC = zlib.crc32(data)
+    
+    if file_path.suffix.lower() in INCOMPRESSIBLE_SUFFIXES:
+        zinfo.compress_type = zipfile.ZIP_STORED
+        payload = data
+    else:
+        # Raw deflate stream (no zlib header), as stored in ZIP members
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15)
+        payload = compressor.compress(data) + compressor.flush()
+    
+    zinfo.compress_size = len(payload)
+    return zinfo, payload
+
+# Private ZipFile state _write_precompressed touches; not a stable API
+_ZIP_INTERNALS = ("_lock", "_writecheck", "_seekable", "start_dir", "_didModify", "_allowZip64")
+
+def _supports_raw_writes() -> bool:
+    """Whether this Python's ZipFile still has every internal _write_precompressed needs"""
+    with zipfile.ZipFile(io.BytesIO(), 'w') as probe:
+        return all(hasattr(probe, name) for name in _ZIP_INTERNALS)
+
+# Checked once at import; without them members go through ZipFile.write instead
+_RAW_ZIP_WRITES = _supports_raw_writes()
+
+def _write_precompressed(zf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, payload: bytes):
+    """Append an already-compressed member, mirroring ZipFile.mkdir's raw write"""
+    zip64 = zf._allowZip64 and max(zinfo.file_size, zinfo.compress_size) > zipfile.ZIP64_LIMIT
+    with zf._lock:
+        if zf._seekable:
+            zf.fp.seek(zf.start_dir)
+        zinfo.header_offset = zf.fp.tell()
+        zf._writecheck(zinfo)
+        zf._didModify = True
+        
+        zf.fp.write(zinfo.FileHeader(zip64))
+        zf.fp.write(payload)
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+        zf.start_dir = zf.fp.tell()
 
 class ExtensionBuilder:
     """Professional extension builder with validation and optimization"""
     
-    def __init__(self, project_root: Path):
+    def __init__(self, project_root: Path, jobs: int = 1, compresslevel: int = 6,
+                 incremental: bool = False):
         self.project_root = project_root
+        self.jobs = max(1, jobs)
+        self.compresslevel = compresslevel
+        self.incremental = incremental
         self.build_dir = project_root / "build"
         self.dist_dir = project_root / "dist"
+        self.package_contents = None
+        self._manifest_cache = {}
+        # Build-wide facts, looked up once (platform.platform() can fork uname)
+        self._platform = platform.platform()
+        self._py_version = platform.python_version()
+        self._build_ts = datetime.now()
+        self._file_hashes = self._load_file_hashes() if incremental else {}
+        self._seen_sources = set()  # Sources staged this build; the rest are pruned from the hashes
         self.version = self._get_version()
         
+    def _load_manifest(self, path: Path) -> dict:
+        """Parse a manifest file, cached until its mtime or size changes"""
+        st = path.stat()
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        if key not in self._manifest_cache:
+            self._manifest_cache[key] = _loads(path.read_bytes())
+        return self._manifest_cache[key]
+    
     def _get_version(self) -> str:
         """Get version from manifest or git"""
         manifest_file = self.project_root / "manifest.json"
         if manifest_file.exists():
-            with open(manifest_file) as f:
-                manifest = json.load(f)
-                return manifest.get("version", "1.0.0")
+            return self._load_manifest(manifest_file).get("version", "1.0.0")
         return "1.0.0"
     
+    def _load_file_hashes(self) -> dict:
+        """Load source fingerprints recorded by the previous incremental build"""
+        hashes_file = self.build_dir / FILE_HASHES_NAME
+        if hashes_file.exists():
+            try:
+                return _loads(hashes_file.read_bytes())
+            except ValueError:
+                pass
+        return {}
+    
+    def save_file_hashes(self):
+        """Persist source fingerprints for the next incremental build"""
+        if self.incremental:
+            # Drop entries for sources that no longer exist or are no longer staged
+            self._file_hashes = {
+                key: entry for key, entry in self._file_hashes.items() if key in self._seen_sources
+            }
+            (self.build_dir / FILE_HASHES_NAME).write_text(_dumps(self._file_hashes), encoding='utf-8')
+    
+    def _needs_copy(self, src_file, dst_file) -> bool:
+        """Whether dst_file must be (re)staged from src_file
+        
+        Always true for full builds. Incremental builds skip files whose
+        destination exists and whose source content ID is unchanged; the
+        ID is only recomputed when the source mtime or size moved.
+        """
+        if not self.incremental:
+            return True
+        
+        st = os.stat(src_file)
+        key = str(src_file)
+        self._seen_sources.add(key)
+        previous = self._file_hashes.get(key)
+        if previous and (previous["mtime_ns"], previous["size"]) == (st.st_mtime_ns, st.st_size):
+            digest = previous["hash"]
+        else:
+            digest = self._calculate_fast_hash(src_file)
+        self._file_hashes[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "hash": digest}
+        
+        return not (previous and previous["hash"] == digest and os.path.exists(dst_file))
+    
+    def _remove_stale(self, root: Path, keep: set):
+        """Delete staged files under root that are not in keep, then any emptied directories
+        
+        Only incremental builds reuse a staging directory, so full builds skip this.
+        """
+        if not self.incremental or not root.exists():
+            return
+        for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if path not in keep:
+                    os.unlink(path)
+            if dirpath != str(root) and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+    
     def clean(self):
         """Clean previous builds"""
-        print("🧹 Cleaning previous builds...")
+        _print("🧹 Cleaning previous builds...")
         
         for directory in [self.build_dir, self.dist_dir]:
             if directory.exists():
@@ -46,13 +384,16 @@ class ExtensionBuilder:
         self.build_dir.mkdir(exist_ok=True)
         self.dist_dir.mkdir(exist_ok=True)
         
-        print("✅ Build directories cleaned")
+        _print("✅ Build directories cleaned")
     
     def install_dependencies(self):
         """Install and bundle Python dependencies"""
-        print("📦 Installing and bundling dependencies...")
+        _print("📦 Installing and bundling dependencies...")
         
         lib_dir = self.build_dir / "lib"
+        if self.incremental and lib_dir.exists() and any(lib_dir.iterdir()):
+            _print("  ✅ Reusing bundled dependencies (incremental build)")
+            return
         lib_dir.mkdir(exist_ok=True)
         
         # Core dependencies for the extension
@@ -70,48 +411,114 @@ class ExtensionBuilder:
         elif system == "linux":
             dependencies.append("plyer>=2.0")
         
-        # Install each dependency
-        for dep in dependencies:
-            print(f"  Installing {dep}...")
+        _print(f"  Installing {', '.join(dependencies)}...")
+        if self.jobs > 1:
+            # Install each dependency concurrently (--no-deps means no overlap)
+            self._pip_install_each(lib_dir, dependencies)
+        elif not self._install_wheels(lib_dir, dependencies):
+            # Install all dependencies in a single pip invocation
+            try:
+                self._pip_install(lib_dir, dependencies)
+            except subprocess.CalledProcessError:
+                # Retry individually so one bad dependency doesn't abort the rest
+                self._pip_install_each(lib_dir, dependencies)
+        
+        # Clean up unnecessary files, sizing what is kept in the same walk
+        dep_size = self._cleanup_dependencies(lib_dir)
+        _print(f"✅ Dependencies bundled ({dep_size // 1024 // 1024} MB)")
+    
+    def _install_wheels(self, lib_dir: Path, dependencies: list) -> bool:
+        """Download wheels with one pip call and unpack them with `installer`
+        
+        Skips pip's install machinery entirely. Returns False when installer
+        is not available or a dependency has no wheel, so the caller can
+        fall back to pip install.
+        """
+        try:
+            from installer import install
+            from installer.destinations import SchemeDictionaryDestination
+            from installer.sources import WheelFile
+        except ImportError:
+            return False
+        
+        with tempfile.TemporaryDirectory() as download_dir:
             try:
                 subprocess.run([
-                    sys.executable, "-m", "pip", "install",
-                    "--target", str(lib_dir),
-                    "--no-deps", "--no-compile",
-                    dep
+                    sys.executable, "-m", "pip", "download",
+                    "--dest", download_dir,
+                    "--no-deps", "--only-binary=:all:",
+                    *dependencies
                 ], check=True, capture_output=True, text=True)
-                
+            except subprocess.CalledProcessError:
+                return False
+            
+            destination = SchemeDictionaryDestination(
+                {
+                    "purelib": str(lib_dir),
+                    "platlib": str(lib_dir),
+                    "headers": str(lib_dir / "include"),
+                    "scripts": str(lib_dir / "bin"),
+                    "data": str(lib_dir),
+                },
+                interpreter=sys.executable,
+                script_kind="win-amd64" if os.name == "nt" else "posix",
+            )
+            for wheel_path in sorted(Path(download_dir).glob("*.whl")):
+                with WheelFile.open(wheel_path) as source:
+                    install(source, destination, additional_metadata={})
+        
+        return True
+    
+    def _pip_install(self, lib_dir: Path, dependencies: list):
+        """Install dependencies into lib_dir with a single pip call"""
+        subprocess.run([
+            sys.executable, "-m", "pip", "install",
+            "--target", str(lib_dir),
+            "--no-deps", "--no-compile",
+            *dependencies
+        ], check=True, capture_output=True, text=True)
+    
+    def _pip_install_each(self, lib_dir: Path, dependencies: list):
+        """Install dependencies one per pip call, up to self.jobs at a time"""
+        def install(dep):
+            try:
+                self._pip_install(lib_dir, [dep])
             except subprocess.CalledProcessError as e:
-                print(f"⚠️  Warning: Failed to install {dep}: {e}")
+                _print(f"⚠️  Warning: Failed to install {dep}: {e}")
                 # Continue with other dependencies
-        
-        # Clean up unnecessary files
-        self._cleanup_dependencies(lib_dir)
-        
-        dep_size = sum(f.stat().st_size for f in lib_dir.rglob('*') if f.is_file())
-        print(f"✅ Dependencies bundled ({dep_size // 1024 // 1024} MB)")
-    
-    def _cleanup_dependencies(self, lib_dir: Path):
-        """Remove unnecessary files from dependencies"""
-        patterns_to_remove = [
-            "*.pyc", "*.pyo", "__pycache__",
-            "*.dist-info", "*.egg-info",
-            "tests", "test", "testing",
-            "docs", "doc", "examples",
-            "*.md", "*.rst", "*.txt",
-            ".git*", ".tox", ".pytest_cache"
-        ]
-        
-        for pattern in patterns_to_remove:
-            for path in lib_dir.rglob(pattern):
-                if path.is_file():
-                    path.unlink()
-                elif path.is_dir():
-                    shutil.rmtree(path, ignore_errors=True)
+
+        with ThreadPoolExecutor(max_workers=min(self.jobs, len(dependencies))) as executor:
+            list(executor.map(install, dependencies))
+    
+    def _cleanup_dependencies(self, lib_dir: Path) -> int:
+        """Remove unnecessary files from dependencies, returning the kept size in bytes"""
+        # Single scandir walk; matched directories are pruned rather than descended,
+        # and kept file sizes come from the cached DirEntry stat
+        files_to_remove = []
+        dirs_to_remove = []
+        kept_size = 0
+        pending = [str(lib_dir)]
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if _CLEANUP_RE.match(entry.name):
+                        (dirs_to_remove if is_dir else files_to_remove).append(entry.path)
+                    elif is_dir:
+                        pending.append(entry.path)
+                    else:
+                        kept_size += entry.stat(follow_symlinks=False).st_size
+        
+        # unlink/rmtree are syscall-bound, so overlap them on a thread pool
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(os.unlink, files_to_remove))
+            list(executor.map(lambda path: shutil.rmtree(path, ignore_errors=True), dirs_to_remove))
+        
+        return kept_size
     
     def copy_server_files(self):
         """Copy and optimize server files"""
-        print("📋 Copying server files...")
+        _print("📋 Copying server files...")
         
         server_dir = self.build_dir / "server"
         server_dir.mkdir(exist_ok=True)
@@ -122,17 +529,24 @@ class ExtensionBuilder:
             "standalone_mcp_server.py"  # From original project
         ]
         
-        for filename in server_files:
+        def stage_server_file(filename):
             src_file = self.project_root / "server" / filename
-            if src_file.exists():
-                dst_file = server_dir / filename
-                shutil.copy2(src_file, dst_file)
-                
-                # Optimize Python files
-                self._optimize_python_file(dst_file)
-                print(f"  ✅ {filename}")
-            else:
-                print(f"  ⚠️  Missing: {filename}")
+            dst_file = server_dir / filename
+            if not src_file.exists():
+                if self.incremental and dst_file.exists():
+                    dst_file.unlink()  # Don't package a copy left by an earlier build
+                return f"  ⚠️  Missing: {filename}"
+            
+            if not self._needs_copy(src_file, dst_file):
+                return f"  ✅ {filename} (unchanged)"
+            
+            # Optimize in memory and write the result once
+            self._optimize_python_file(src_file, dst_file)
+            return f"  ✅ {filename}"
+        
+        with ThreadPoolExecutor(max_workers=len(server_files)) as executor:
+            for status in executor.map(stage_server_file, server_files):
+                _print(status)
         
         # Create __init__.py
         (server_dir / "__init__.py").write_text(
@@ -142,32 +556,55 @@ class ExtensionBuilder:
         
         # Copy utility modules if they exist
         utils_src = self.project_root / "server" / "utils"
+        utils_dst = server_dir / "utils"
         if utils_src.exists():
-            utils_dst = server_dir / "utils"
-            shutil.copytree(utils_src, utils_dst)
-            print("  ✅ Utils modules")
+            self._copytree_mt(utils_src, utils_dst)
+            _print("  ✅ Utils modules")
+        else:
+            self._remove_stale(utils_dst, set())
     
-    def _optimize_python_file(self, file_path: Path):
-        """Basic Python file optimization"""
-        with open(file_path, 'r', encoding='utf-8') as f:
+    def _copytree_mt(self, src: Path, dst: Path, max_workers: int = 4):
+        """Copy a directory tree, overlapping the per-file copies on a thread pool"""
+        pairs = []
+        pending = [(src, dst)]
+        while pending:
+            src_dir, dst_dir = pending.pop()
+            dst_dir.mkdir(parents=True, exist_ok=True)
+            with os.scandir(src_dir) as entries:
+                for entry in entries:
+                    target = dst_dir / entry.name
+                    if entry.is_dir():
+                        pending.append((Path(entry.path), target))
+                    else:
+                        pairs.append((entry.path, target))
+        
+        self._remove_stale(dst, {str(target) for _, target in pairs})
+        pairs = [pair for pair in pairs if self._needs_copy(*pair)]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(lambda pair: shutil.copy2(*pair), pairs))
+    
+    def _optimize_python_file(self, src_file: Path, dst_file: Path):
+        """Basic Python file optimization, writing src_file to dst_file"""
+        with open(src_file, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Remove debug prints and excessive comments
-        lines = content.split('\n')
-        optimized_lines = []
+        # Remove debug prints in one regex pass over the whole source
+        optimized = _DEBUG_PRINT_RE.sub('', content)
+        
+        # Leave an already-optimized destination untouched so its mtime is stable
+        if dst_file.exists() and dst_file.read_text(encoding='utf-8') == optimized:
+            return
         
-        for line in lines:
-            stripped = line.strip()
-            # Keep the line unless it's a debug print
-            if not (stripped.startswith('print(') and 'debug' in stripped.lower()):
-                optimized_lines.append(line)
+        if optimized == content:
+            shutil.copyfile(src_file, dst_file)
+            return
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(optimized_lines))
+        with open(dst_file, 'w', encoding='utf-8') as f:
+            f.write(optimized)
     
     def create_assets(self):
         """Create or copy assets"""
-        print("🎨 Creating assets...")
+        _print("🎨 Creating assets...")
         
         assets_dir = self.build_dir / "assets"
         assets_dir.mkdir(exist_ok=True)
@@ -175,14 +612,17 @@ class ExtensionBuilder:
         # Copy existing assets if available
         src_assets = self.project_root / "assets"
         if src_assets.exists():
-            for asset_file in src_assets.iterdir():
-                if asset_file.is_file():
-                    shutil.copy2(asset_file, assets_dir)
-            print("  ✅ Copied existing assets")
+            sources = [f for f in src_assets.iterdir() if f.is_file()]
+            self._remove_stale(assets_dir, {str(assets_dir / f.name) for f in sources})
+            asset_files = [f for f in sources if self._needs_copy(f, assets_dir / f.name)]
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda f: shutil.copyfile(f, assets_dir / f.name), asset_files))
+            _print("  ✅ Copied existing assets")
         else:
             # Create placeholder assets
+            self._remove_stale(assets_dir, set())
             self._create_placeholder_assets(assets_dir)
-            print("  ✅ Created placeholder assets")
+            _print("  ✅ Created placeholder assets")
     
     def _create_placeholder_assets(self, assets_dir: Path):
         """Create placeholder assets for testing"""
@@ -202,7 +642,7 @@ class ExtensionBuilder:
     
     def validate_manifest(self):
         """Validate and update manifest"""
-        print("📋 Validating manifest...")
+        _print("📋 Validating manifest...")
         
         manifest_src = self.project_root / "manifest.json"
         manifest_dst = self.build_dir / "manifest.json"
@@ -210,8 +650,8 @@ class ExtensionBuilder:
         if not manifest_src.exists():
             raise FileNotFoundError("manifest.json not found in project root")
         
-        with open(manifest_src) as f:
-            manifest = json.load(f)
+        # Copy, since the manifest is updated below and the parse is cached
+        manifest = copy.deepcopy(self._load_manifest(manifest_src))
         
         # Validation checks
         required_fields = ["dxt_version", "name", "version", "description", "server"]
@@ -224,7 +664,7 @@ class ExtensionBuilder:
             manifest["server"]["entry_point"] = "server/claude_jester_desktop.py"
         
         # Update version with build timestamp
-        build_time = datetime.now().strftime("%Y%m%d.%H%M")
+        build_time = self._build_ts.strftime("%Y%m%d.%H%M")
         if "+" not in manifest["version"]:
             manifest["version"] = f"{manifest['version']}+{build_time}"
         
@@ -236,15 +676,15 @@ class ExtensionBuilder:
                 mcp_config["env"] = {}
             mcp_config["env"]["PYTHONPATH"] = "${__dirname}/server:${__dirname}/lib"
         
-        with open(manifest_dst, 'w') as f:
-            json.dump(manifest, f, indent=2)
+        with open(manifest_dst, 'w', encoding='utf-8') as f:
+            f.write(_dumps(manifest))
         
-        print(f"  ✅ Manifest validated: {manifest['name']} v{manifest['version']}")
+        _print(f"  ✅ Manifest validated: {manifest['name']} v{manifest['version']}")
         return manifest
     
     def copy_documentation(self):
         """Copy documentation files"""
-        print("📚 Copying documentation...")
+        _print("📚 Copying documentation...")
         
         docs_to_copy = [
             ("README.md", "README.md"),
@@ -256,46 +696,77 @@ class ExtensionBuilder:
         
         for src_path, dst_name in docs_to_copy:
             src_file = self.project_root / src_path
+            dst_file = self.build_dir / dst_name
             if src_file.exists():
-                dst_file = self.build_dir / dst_name
-                shutil.copy2(src_file, dst_file)
-                print(f"  ✅ {dst_name}")
+                if self._needs_copy(src_file, dst_file):
+                    shutil.copyfile(src_file, dst_file)
+                _print(f"  ✅ {dst_name}")
+            elif self.incremental and dst_file.exists():
+                dst_file.unlink()  # Removed from the source since the last build
     
     def create_package(self, manifest: dict):
         """Create the final .dxt package"""
-        print("📦 Creating .dxt package...")
+        _print("📦 Creating .dxt package...")
         
         package_name = manifest["name"]
         version = manifest["version"].split('+')[0]  # Remove build timestamp
         dxt_filename = f"{package_name}-{version}.dxt"
         dxt_path = self.dist_dir / dxt_filename
         
-        # Create the ZIP archive
-        with zipfile.ZipFile(dxt_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
-            for file_path in self.build_dir.rglob('*'):
-                if file_path.is_file():
-                    arc_path = file_path.relative_to(self.build_dir)
-                    zf.write(file_path, arc_path)
-                    
-            # Add build metadata
-            build_info = {
-                "build_time": datetime.now().isoformat(),
-                "builder_platform": platform.platform(),
-                "python_version": platform.python_version(),
-                "package_version": version
-            }
-            
-            zf.writestr("build_info.json", json.dumps(build_info, indent=2))
+        # Create the ZIP archive, hashing and recording it as it is written
+        contents = ValidationAccumulator()
+        # A 1 MiB buffer coalesces the many small header/payload writes
+        with open(dxt_path, 'wb', buffering=1 << 20) as raw:
+            hashing_writer = _HashingWriter(raw)
+            with zipfile.ZipFile(hashing_writer, 'w', zipfile.ZIP_DEFLATED,
+                                 compresslevel=self.compresslevel) as zf:
+                members = [
+                    (file_path, file_path.relative_to(self.build_dir).as_posix())
+                    for file_path in self.build_dir.rglob('*')
+                    if file_path.is_file() and file_path != self.build_dir / FILE_HASHES_NAME
+                ]
+                
+                if _RAW_ZIP_WRITES:
+                    # Compress on worker threads (zlib releases the GIL); write serially
+                    with ThreadPoolExecutor() as executor:
+                        compressed = executor.map(
+                            lambda member: _compress_member(*member, self.compresslevel), members
+                        )
+                        for (file_path, _), (zinfo, payload) in zip(members, compressed):
+                            _write_precompressed(zf, zinfo, payload)
+                            contents.add(zinfo.filename, zinfo.file_size)
+                            if zinfo.filename == "manifest.json":
+                                contents.manifest_bytes = file_path.read_bytes()
+                else:
+                    for file_path, arc_name in members:
+                        stored = file_path.suffix.lower() in INCOMPRESSIBLE_SUFFIXES
+                        zf.write(file_path, arc_name, compress_type=zipfile.ZIP_STORED if stored else None)
+                        contents.add(arc_name, zf.getinfo(arc_name).file_size)
+                        if arc_name == "manifest.json":
+                            contents.manifest_bytes = file_path.read_bytes()
+                        
+                # Add build metadata
+                build_info = {
+                    "build_time": self._build_ts.isoformat(),
+                    "builder_platform": self._platform,
+                    "python_version": self._py_version,
+                    "package_version": version
+                }
+                
+                build_info_json = _dumps(build_info)
+                zf.writestr("build_info.json", build_info_json)
+                contents.add("build_info.json", len(build_info_json.encode()))
         
-        # Calculate package hash
-        package_hash = self._calculate_file_hash(dxt_path)
+        self.package_contents = contents
+        
+        package_hash = hashing_writer.hash.hexdigest()
         
         # Get package size
         size_mb = dxt_path.stat().st_size / (1024 * 1024)
         
-        print(f"✅ Package created: {dxt_path.name}")
-        print(f"📦 Size: {size_mb:.1f} MB")
-        print(f"🔒 SHA256: {package_hash[:16]}...")
+        _print(f"✅ Package created: {dxt_path.name}")
+        _print(f"📦 Size: {size_mb:.1f} MB")
+        _print(f"🔒 SHA256: {package_hash[:16]}...")
         
         # Create package info file
         package_info = {
@@ -304,209 +775,127 @@ class ExtensionBuilder:
             "size_mb": round(size_mb, 1),
             "sha256": package_hash,
             "version": version,
-            "build_time": datetime.now().isoformat(),
-            "platform": platform.platform()
+            "build_time": self._build_ts.isoformat(),
+            "platform": self._platform
         }
         
         info_file = self.dist_dir / f"{package_name}-{version}.json"
-        with open(info_file, 'w') as f:
-            json.dump(package_info, f, indent=2)
+        with open(info_file, 'w', encoding='utf-8') as f:
+            f.write(_dumps(package_info))
         
         return dxt_path, package_info
     
     def _calculate_file_hash(self, file_path: Path) -> str:
         """Calculate SHA256 hash of file"""
-        sha256_hash = hashlib.sha256()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+
+                return hashlib.file_digest(f, "sha256").hexdigest()
+            sha256_hash = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
                 sha256_hash.update(chunk)
         return sha256_hash.hexdigest()
     
-    def validate_package(self, dxt_path: Path):
-        """Validate the created package"""
-        print("🔍 Validating package...")
+    def _calculate_fast_hash(self, file_path) -> str:
+        """Calculate a fast, non-cryptographic content ID of file"""
+        content_hash = _fast_hash()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                content_hash.update(chunk)
+        return content_hash.hexdigest()
+    
+    def validate_package(self, dxt_path: Path, contents: ValidationAccumulator = None):
+        """Validate the created package
+        
+        When contents recorded by create_package are given, the package is
+        not reopened; otherwise they are gathered from the archive.
+        """
+        _print("🔍 Validating package...")
         
         errors = []
         warnings = []
         
-        with zipfile.ZipFile(dxt_path, 'r') as zf:
-            files = zf.namelist()
-            
-            # Check required files
-            required_files = [
-                "manifest.json",
-                "server/claude_jester_desktop.py"
-            ]
+        if contents is None:
+            with zipfile.ZipFile(dxt_path, 'r') as zf:
+                contents = ValidationAccumulator.from_zip(zf)
+        
+        # Check required files
+        for required in contents.REQUIRED_FILES:
+            if required not in contents.required_seen:
+                errors.append(f"Missing required file: {required}")
+        
+        # Validate manifest
+        try:
+            if contents.manifest_bytes is None:
+                raise KeyError("There is no item named 'manifest.json' in the archive")
+            manifest = _loads(contents.manifest_bytes)
             
-            for required in required_files:
-                if required not in files:
-                    errors.append(f"Missing required file: {required}")
+            # Check manifest structure
+            if not manifest.get("dxt_version"):
+                errors.append("Missing dxt_version in manifest")
             
-            # Validate manifest
-            try:
-                manifest_content = zf.read("manifest.json")
-                manifest = json.loads(manifest_content)
-                
-                # Check manifest structure
-                if not manifest.get("dxt_version"):
-                    errors.append("Missing dxt_version in manifest")
+            if not manifest.get("server", {}).get("entry_point"):
+                errors.append("Missing server.entry_point in manifest")
                 
-                if not manifest.get("server", {}).get("entry_point"):
-                    errors.append("Missing server.entry_point in manifest")
-                    
-            except json.JSONDecodeError as e:
-                errors.append(f"Invalid manifest JSON: {e}")
-            except Exception as e:
-                errors.append(f"Manifest validation error: {e}")
-            
-            # Check file sizes
-            total_size = sum(zinfo.file_size for zinfo in zf.infolist())
-            if total_size > 100 * 1024 * 1024:  # 100MB limit
-                warnings.append(f"Package is large: {total_size // 1024 // 1024}MB")
-            
-            # Check for common issues
-            py_files = [f for f in files if f.endswith('.py')]
-            if not py_files:
-                warnings.append("No Python files found")
-            
-            # Check for unnecessary files
-            unnecessary_patterns = ['.pyc', '__pycache__', '.git', '.DS_Store']
-            unnecessary_files = []
-            for pattern in unnecessary_patterns:
-                unnecessary_files.extend([f for f in files if pattern in f])
-            
-            if unnecessary_files:
-                warnings.append(f"Unnecessary files found: {len(unnecessary_files)} files")
+        except json.JSONDecodeError as e:
+            errors.append(f"Invalid manifest JSON: {e}")
+        except Exception as e:
+            errors.append(f"Manifest validation error: {e}")
+        
+        # Check file sizes
+        if contents.total_size > 100 * 1024 * 1024:  # 100MB limit
+            warnings.append(f"Package is large: {contents.total_size // 1024 // 1024}MB")
+        
+        # Check for common issues
+        if not contents.py_count:
+            warnings.append("No Python files found")
+        
+        # Check for unnecessary files
+        if contents.unnecessary_count:
+            warnings.append(f"Unnecessary files found: {contents.unnecessary_count} files")
         
         # Report validation results
         if errors:
-            print("❌ Validation failed:")
+            _print("❌ Validation failed:")
             for error in errors:
-                print(f"  💥 {error}")
+                _print(f"  💥 {error}")
             return False
         
         if warnings:
-            print("⚠️  Validation warnings:")
+            _print("⚠️  Validation warnings:")
             for warning in warnings:
-                print(f"  ⚠️  {warning}")
+                _print(f"  ⚠️  {warning}")
         
-        print("✅ Package validation successful")
+        _print("✅ Package validation successful")
         return True
     
     def generate_installation_script(self, package_info: dict):
         """Generate installation scripts for different platforms"""
-        print("📝 Generating installation helpers...")
+        _print("📝 Generating installation helpers...")
         
         scripts_dir = self.dist_dir / "installation"
         scripts_dir.mkdir(exist_ok=True)
         
-        package_name = package_info["filename"]
-        
-        # PowerShell script for Windows
-        powershell_script = f'''# Claude-Jester Desktop Extension Installer
-# Run this script to install the extension automatically
-
-Write-Host "🃏 Claude-Jester Desktop Extension Installer" -ForegroundColor Cyan
-Write-Host "Package: {package_name}" -ForegroundColor Green
-
-$claudeConfigPath = "$env:APPDATA\\Claude\\claude_desktop_config.json"
-$extensionPath = ".\{package_name}"
-
-if (-not (Test-Path $extensionPath)) {{
-    Write-Host "❌ Extension package not found: $extensionPath" -ForegroundColor Red
-    exit 1
-}}
-
-Write-Host "📁 Found Claude Desktop config: $claudeConfigPath" -ForegroundColor Green
-Write-Host "📦 Installing extension..." -ForegroundColor Yellow
-
-# Launch Claude Desktop with extension
-Start-Process "claude://install-extension?path=$((Resolve-Path $extensionPath).Path)"
-
-Write-Host "✅ Installation initiated. Check Claude Desktop for completion." -ForegroundColor Green
-Write-Host "🔧 Configure the extension in Settings > Extensions" -ForegroundColor Yellow
-'''
-        
-        (scripts_dir / "install-windows.ps1").write_text(powershell_script)
-        
-        # Bash script for macOS/Linux
-        bash_script = f'''#!/bin/bash
-# Claude-Jester Desktop Extension Installer
-
-echo "🃏 Claude-Jester Desktop Extension Installer"
-echo "Package: {package_name}"
-
-CLAUDE_CONFIG="$HOME/Library/Application Support/Claude/claude_desktop_config.json"
-if [[ "$OSTYPE" == "linux-gnu"* ]]; then
-    CLAUDE_CONFIG="$HOME/.config/claude/claude_desktop_config.json"
-fi
-
-EXTENSION_PATH="./{package_name}"
-
-if [ ! -f "$EXTENSION_PATH" ]; then
-    echo "❌ Extension package not found: $EXTENSION_PATH"
-    exit 1
-fi
-
-echo "📁 Claude Desktop config: $CLAUDE_CONFIG"
-echo "📦 Installing extension..."
-
-# Launch Claude Desktop with extension
-if [[ "$OSTYPE" == "darwin"* ]]; then
-    open "claude://install-extension?path=$(realpath "$EXTENSION_PATH")"
-else
-    xdg-open "claude://install-extension?path=$(realpath "$EXTENSION_PATH")"
-fi
-
-echo "✅ Installation initiated. Check Claude Desktop for completion."
-echo "🔧 Configure the extension in Settings > Extensions"
-'''
+        fields = {
+            "package_name": package_info["filename"],
+            "version": package_info["version"],
+            "size_mb": package_info["size_mb"],
+            "sha256": package_info["sha256"],
+            "build_time": package_info["build_time"],
+        }
+        scripts = [
+            (scripts_dir / "install-windows.ps1", INSTALL_WINDOWS_TEMPLATE),  # PowerShell for Windows
+            (scripts_dir / "install-unix.sh", INSTALL_UNIX_TEMPLATE),  # Bash for macOS/Linux
+            (scripts_dir / "README.md", INSTALL_README_TEMPLATE),
+        ]
         
-        (scripts_dir / "install-unix.sh").write_text(bash_script)
+        with ThreadPoolExecutor(max_workers=len(scripts)) as executor:
+            list(executor.map(
+                lambda script: script[0].write_text(script[1].format(**fields), encoding='utf-8'),
+                scripts
+            ))
         os.chmod(scripts_dir / "install-unix.sh", 0o755)
         
-        # Create README for installation
-        install_readme = f'''# Claude-Jester Desktop Extension Installation
-
-## Automatic Installation
-
-### Windows
-1. Download `{package_name}` and `installation/install-windows.ps1`
-2. Place both files in the same directory
-3. Right-click `install-windows.ps1` and select "Run with PowerShell"
-4. Follow the prompts in Claude Desktop
-
-### macOS/Linux
-1. Download `{package_name}` and `installation/install-unix.sh`
-2. Place both files in the same directory
-3. Run: `./installation/install-unix.sh`
-4. Follow the prompts in Claude Desktop
-
-## Manual Installation
-
-1. Open Claude Desktop
-2. Go to Settings > Extensions
-3. Drag and drop `{package_name}` into the Extensions panel
-4. Configure extension preferences
-5. Start using quantum debugging features!
-
-## Package Information
-
-- **Version**: {package_info["version"]}
-- **Size**: {package_info["size_mb"]} MB
-- **SHA256**: `{package_info["sha256"]}`
-- **Build**: {package_info["build_time"]}
-
-## Support
-
-- Documentation: https://claude-jester.dev
-- Issues: https://github.com/mstanton/claude-jester/issues
-- Security: security@claude-jester.dev
-'''
-        
-        (scripts_dir / "README.md").write_text(install_readme)
-        
-        print(f"  ✅ Installation scripts created in {scripts_dir}")
+        _print(f"  ✅ Installation scripts created in {scripts_dir}")
 
 def main():
     """Main build process"""
@@ -514,10 +903,18 @@ def main():
     parser.add_argument("--clean", action="store_true", help="Clean build directories only")
     parser.add_argument("--validate-only", action="store_true", help="Only validate existing package")
     parser.add_argument("--project-root", type=Path, default=Path.cwd(), help="Project root directory")
+    parser.add_argument("--jobs", type=int, default=1, help="Parallel dependency installs (1 = single batched pip call)")
+    parser.add_argument("--compresslevel", type=int, default=6, choices=range(10), metavar="0-9",
+                        help="Deflate level for compressible files (1 is fastest for dev builds)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reuse the previous build directory, restaging only changed files")
+    parser.add_argument("--paranoid", action="store_true",
+                        help="Validate by re-reading the finished package instead of the build's own record")
     
     args = parser.parse_args()
     
-    builder = ExtensionBuilder(args.project_root)
+    builder = ExtensionBuilder(args.project_root, jobs=args.jobs, compresslevel=args.compresslevel,
+                               incremental=args.incremental)
     
     try:
         if args.clean:
@@ -540,16 +937,32 @@ def main():
         print("🃏 Claude-Jester Desktop Extension Builder")
         print("=" * 50)
         
-        builder.clean()
-        builder.install_dependencies()
-        builder.copy_server_files()
-        builder.create_assets()
-        manifest = builder.validate_manifest()
-        builder.copy_documentation()
+        if args.incremental:
+            builder.build_dir.mkdir(exist_ok=True)
+            builder.dist_dir.mkdir(exist_ok=True)
+        else:
+            builder.clean()
+        
+        # Staging stages are independent: dependency installs are network-bound
+        # and the copies disk-bound, so run them concurrently
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            stages = [
+                executor.submit(builder.install_dependencies),
+                executor.submit(builder.copy_server_files),
+                executor.submit(builder.create_assets),
+                executor.submit(builder.copy_documentation),
+            ]
+            manifest_future = executor.submit(builder.validate_manifest)
+            for stage in stages:
+                stage.result()
+            manifest = manifest_future.result()
+        builder.save_file_hashes()
         
         dxt_path, package_info = builder.create_package(manifest)
         
-        if builder.validate_package(dxt_path):
+        # The build already recorded what it wrote; re-read the .dxt only if asked
+        contents = None if args.paranoid else builder.package_contents
+        if builder.validate_package(dxt_path, contents):
             builder.generate_installation_script(package_info)
             
             print("\n🎉 Build completed successfully!")
@@ -5,14 +5,88 @@ Core MCP functionality imported by the desktop extension server
 """
 
 import asyncio
-import subprocess
+import json
+import shlex
 import tempfile
 import os
 import sys
 import time
 import uuid
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
+
+# Prefer orjson for warm-container frames and podman's JSON output
+try:
+    import orjson
+    
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+    
+    _loads = json.loads
+
+LANGUAGE_IMAGES = {
+    "python": "python:3.11-alpine",
+    "javascript": "node:18-alpine",
+    "bash": "alpine:latest",
+}
+
+# Every container this module starts carries this label so cleanup can find them
+CONTAINER_LABEL = "claude-jester=1"
+
+# Wall-clock limit for a single execution, warm or one-shot
+_JOB_TIMEOUT = 30.0
+
+# Pre-started containers kept per (language, security_level); 0 disables the pool.
+# Each runs a single job and is then discarded, so no job sees another's files
+# or processes; the pool only takes the container start off the critical path
+_WARM_CONTAINERS_PER_LANG = int(os.environ.get("CLAUDE_JESTER_WARM_CONTAINERS", "2"))
+_WARM_IDLE_TIMEOUT = 600.0
+# "maximum" keeps a fresh container per execution
+_WARM_SECURITY_LEVELS = ("balanced",)
+_FRAME_SEP = b"\x1e"
+_FRAME_END = _FRAME_SEP + b"\n"
+# Operator override for podman's --pull policy (always, missing, never, newer)
+_PULL_POLICY = os.environ.get("CLAUDE_JESTER_PULL_POLICY", "").strip().lower()
+# StreamReader buffer for warm-container stdout; larger frames are read in pieces
+_STREAM_LIMIT = 1 << 20
+
+# The job runs in a child with its code on stdin, exactly as in a one-shot
+# container, so output written straight to fds 1 and 2 is captured rather
+# than landing outside the frame
+_PYTHON_RUNNER = r'''
+import json, subprocess, sys
+for line in sys.stdin:
+    job = json.loads(line)
+    proc = subprocess.run([sys.executable, "-"], input=job["code"].encode(),
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    sys.stdout.write("\x1e" + json.dumps({
+        "success": proc.returncode == 0,
+        "output": proc.stdout.decode(errors="replace"),
+        "error": proc.stderr.decode(errors="replace"),
+    }) + "\x1e\n")
+    sys.stdout.flush()
+'''
+
+_NODE_RUNNER = r'''
+const {spawnSync} = require("child_process");
+require("readline").createInterface({input: process.stdin}).on("line", (line) => {
+  const job = JSON.parse(line);
+  const proc = spawnSync(process.execPath, ["-"], {input: job.code, encoding: "utf8", maxBuffer: Infinity});
+  process.stdout.write("\x1e" + JSON.stringify({
+    success: proc.status === 0,
+    output: proc.stdout || "",
+    error: (proc.stderr || "") + (proc.error ? String(proc.error) + "\n" : ""),
+  }) + "\x1e\n");
+});
+'''
+
+WARM_RUNNERS = {
+    "python": ["python", "-c", _PYTHON_RUNNER],
+    "javascript": ["node", "-e", _NODE_RUNNER],
+}
 
 @dataclass
 class ExecutionResult:
@@ -26,29 +100,82 @@ class ExecutionResult:
     security_level: str = "unknown"
     method: str = "unknown"
 
+@dataclass
+class WarmContainer:
+    """Pre-started container waiting on stdin for its single job"""
+    name: str
+    proc: Any
+    last_used: float = field(default_factory=time.monotonic)
+
+async def _run(args: list, timeout: float, input: Optional[bytes] = None) -> Tuple[int, str, str]:
+    """Run a command without blocking the event loop, killing it on timeout"""
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(input), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+
+def _security_args(security_level: str) -> list:
+    """Podman isolation flags for a security level"""
+    return [
+        "--label", CONTAINER_LABEL,
+        "--memory", "256m",
+        "--network", "none" if security_level == "maximum" else "slirp4netns",
+        "--read-only" if security_level == "maximum" else "--read-only=false",
+        "--cap-drop", "ALL"
+    ]
+
 class PodmanCodeExecutor:
     """Podman-based code execution with container isolation"""
     
+    AVAILABILITY_TTL = 60.0
+    # (available, monotonic probe time), shared by every executor
+    _AVAILABILITY_CACHE: Optional[Tuple[bool, float]] = None
+    # Parsed `podman version` client section; fixed for the process lifetime
+    _VERSION_CACHE: Dict[str, Any] = {}
+    
     def __init__(self):
         self.session_containers = {}
-        self.available = self._check_podman_availability()
+        self.warm_pool: Dict[tuple, asyncio.Queue] = {}
+        self._warm_counts: Dict[tuple, int] = {}
+        self._warm_tasks = set()
+        self._reaper = None
+        self.pool_hits = 0
+        self.pool_misses = 0
+        self._reap_tasks = set()  # Background removals of finished one-shot containers
+        # Images confirmed present locally by prepull_images()
+        self._local_images = set()
     
-    def _check_podman_availability(self) -> bool:
+    async def _check_podman_availability(self) -> bool:
         """Check if Podman is available on the system"""
+        cls = PodmanCodeExecutor
+        now = time.monotonic()
+        if cls._AVAILABILITY_CACHE and now - cls._AVAILABILITY_CACHE[1] < self.AVAILABILITY_TTL:
+            return cls._AVAILABILITY_CACHE[0]
+        
         try:
-            result = subprocess.run(
-                ["podman", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
+            returncode, _, _ = await _run(["podman", "--version"], 5)
+            available = returncode == 0
+        except (asyncio.TimeoutError, OSError):
+            available = False
+        cls._AVAILABILITY_CACHE = (available, now)
+        return available
+    
+    async def is_available(self) -> bool:
+        """Whether Podman can be used for execution"""
+        return await self._check_podman_availability()
     
     async def execute_code(self, code: str, language: str, security_level: str = "balanced") -> ExecutionResult:
         """Execute code in a Podman container"""
-        if not self.available:
+        if not await self._check_podman_availability():
             return ExecutionResult(
                 success=False,
                 output="",
@@ -60,19 +187,24 @@ class PodmanCodeExecutor:
             )
         
         start_time = time.time()
+        
+        if (_WARM_CONTAINERS_PER_LANG > 0 and language in WARM_RUNNERS
+                and security_level in _WARM_SECURITY_LEVELS):
+            result = await self._execute_warm(code, language, security_level, start_time)
+            if result is not None:
+                return result
+        
         container_id = f"claude-jester-{language}-{uuid.uuid4().hex[:8]}"
+        started = False
         
         try:
-            # Create container based on language
+            # Create container based on language; code is piped over stdin
             if language == "python":
-                image = "python:3.11-alpine"
-                cmd = ["python", "-c", code]
+                cmd = ["python", "-"]
             elif language == "javascript":
-                image = "node:18-alpine"
-                cmd = ["node", "-e", code]
+                cmd = ["node", "-"]
             elif language == "bash":
-                image = "alpine:latest"
-                cmd = ["sh", "-c", code]
+                cmd = ["sh", "-s"]
             else:
                 return ExecutionResult(
                     success=False,
@@ -85,34 +217,33 @@ class PodmanCodeExecutor:
                 )
             
             # Configure security based on level
+            # No --rm: the container is removed in the background once output is in
             podman_args = [
-                "podman", "run", "--rm",
+                "podman", "run", "-i",
                 "--name", container_id,
-                "--memory", "256m",
-                "--timeout", "30",
-                "--network", "none" if security_level == "maximum" else "slirp4netns",
-                "--read-only" if security_level == "maximum" else "--read-only=false",
-                "--cap-drop", "ALL"
-            ]
+                self._pull_flag(LANGUAGE_IMAGES[language])
+            ] + _security_args(security_level)
             
             # Add the image and command
-            podman_args.extend([image] + cmd)
+            podman_args.extend([LANGUAGE_IMAGES[language]] + cmd)
             
             # Execute in container
-            result = subprocess.run(
+            started = True
+            # The wall-clock cap is enforced here; on timeout the background
+            # `podman rm -f` below kills the container
+            returncode, stdout, stderr = await _run(
                 podman_args,
-                capture_output=True,
-                text=True,
-                timeout=35  # Slightly longer than container timeout
+                timeout=_JOB_TIMEOUT,
+                input=code.encode()
             )
             
             execution_time = time.time() - start_time
             
-            if result.returncode == 0:
+            if returncode == 0:
                 return ExecutionResult(
                     success=True,
-                    output=result.stdout,
-                    error=result.stderr if result.stderr else "",
+                    output=stdout,
+                    error=stderr,
                     execution_time=execution_time,
                     memory_usage=0,  # Would need additional logic to get actual memory usage
                     container_id=container_id,
@@ -122,8 +253,8 @@ class PodmanCodeExecutor:
             else:
                 return ExecutionResult(
                     success=False,
-                    output=result.stdout,
-                    error=result.stderr,
+                    output=stdout,
+                    error=stderr,
                     execution_time=execution_time,
                     memory_usage=0,
                     container_id=container_id,
@@ -131,7 +262,7 @@ class PodmanCodeExecutor:
                     method="podman_container"
                 )
         
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             return ExecutionResult(
                 success=False,
                 output="",
@@ -153,35 +284,315 @@ class PodmanCodeExecutor:
                 security_level=security_level,
                 method="podman_error"
             )
+        finally:
+            if started:
+                self._release_container(container_id)
+    
+    def _release_container(self, container_id: str):
+        """Remove a one-shot container without making the caller wait for it"""
+        task = asyncio.ensure_future(self._remove_container(container_id))
+        self._reap_tasks.add(task)
+        task.add_done_callback(self._reap_tasks.discard)
+    
+    @staticmethod
+    async def _remove_container(container_id: str):
+        """Force-remove a container, stopping it first if still running"""
+        try:
+            await _run(["podman", "rm", "-f", "--time=0", container_id], timeout=30)
+        except Exception:
+            pass  # Best effort; cleanup_session sweeps leftovers
+    
+    async def _execute_warm(self, code: str, language: str, security_level: str,
+                            start_time: float) -> Optional[ExecutionResult]:
+        """Run code in a pooled container; None means use a fresh container"""
+        key = (language, security_level)
+        container = await self._acquire_warm(key)
+        if container is None:
+            return None
+        
+        proc = container.proc
+        try:
+            proc.stdin.write(_dumps({"code": code}) + b"\n")
+            await proc.stdin.drain()
+            payload = await asyncio.wait_for(self._read_frame(proc.stdout), _JOB_TIMEOUT)
+            result = _loads(payload)
+        except asyncio.TimeoutError:
+            await self._discard_warm(key, container, kill=True)
+            return ExecutionResult(
+                success=False,
+                output="",
+                error="Container execution timed out",
+                execution_time=time.time() - start_time,
+                memory_usage=0,
+                container_id=container.name,
+                security_level=security_level,
+                method="podman_timeout"
+            )
+        except Exception as e:
+            await self._discard_warm(key, container, kill=True)
+            return ExecutionResult(
+                success=False,
+                output="",
+                error=f"Container execution failed: {str(e)}",
+                execution_time=time.time() - start_time,
+                memory_usage=0,
+                container_id=container.name,
+                security_level=security_level,
+                method="podman_error"
+            )
+        
+        # Single use: the container may have been tampered with by this job
+        self._retire_warm(key, container)
+        return ExecutionResult(
+            success=result.get("success", False),
+            output=result.get("output", ""),
+            error=result.get("error", ""),
+            execution_time=time.time() - start_time,
+            memory_usage=0,
+            container_id=container.name,
+            security_level=security_level,
+            method="podman_warm"
+        )
+    
+    @staticmethod
+    async def _read_frame(stream) -> bytes:
+        """Read one record-separator framed result, skipping stray output"""
+        chunks = []
+        while True:
+            try:
+                chunks.append(await stream.readuntil(_FRAME_END))
+                break
+            except asyncio.LimitOverrunError as e:
+                # Output beyond the buffer limit: take what is buffered and keep looking
+                chunks.append(await stream.readexactly(e.consumed))
+        data = b"".join(chunks)
+        # JSON escapes \x1e, so the last separator before the end opens the frame
+        return data[data.rfind(_FRAME_SEP, 0, -len(_FRAME_END)) + 1:-len(_FRAME_END)]
+    
+    async def _acquire_warm(self, key: tuple) -> Optional[WarmContainer]:
+        """Take an idle container for key, starting one if the pool has room"""
+        queue = self._pool_queue(key)
+        
+        while not queue.empty():
+            container = queue.get_nowait()
+            if container.proc.returncode is None:
+                self.pool_hits += 1
+                return container
+            self._warm_counts[key] -= 1
+        
+        self.pool_misses += 1
+        if self._warm_counts.get(key, 0) >= _WARM_CONTAINERS_PER_LANG:
+            return None
+        
+        self._warm_counts[key] = self._warm_counts.get(key, 0) + 1
+        container = await self._start_warm(*key)
+        if container is None:
+            self._warm_counts[key] -= 1
+        else:
+            self._replenish(key)
+        return container
+    
+    def _pool_queue(self, key: tuple) -> asyncio.Queue:
+        """Idle containers for key, created on first use"""
+        queue = self.warm_pool.get(key)
+        if queue is None:
+            queue = self.warm_pool[key] = asyncio.Queue()
+        return queue
+    
+    async def ensure_warm_containers(self, key: tuple, n: int = _WARM_CONTAINERS_PER_LANG):
+        """Start containers for key in parallel until n are live"""
+        queue = self._pool_queue(key)
+        live = self._warm_counts.get(key, 0)
+        if live >= n:
+            return
+        
+        self._warm_counts[key] = n
+        for container in await asyncio.gather(*[self._start_warm(*key) for _ in range(n - live)]):
+            if container is None:
+                self._warm_counts[key] -= 1
+            else:
+                queue.put_nowait(container)
+    
+    async def warm_up(self):
+        """Pre-pull images, then fill the pool for every pooled language and level"""
+        await self.prepull_images()
+        if _WARM_CONTAINERS_PER_LANG <= 0 or not await self._check_podman_availability():
+            return
+        await asyncio.gather(*[
+            self.ensure_warm_containers((language, level))
+            for language in WARM_RUNNERS for level in _WARM_SECURITY_LEVELS
+        ])
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """Warm pool hit rate and idle container counts, for tuning the pool size"""
+        total = self.pool_hits + self.pool_misses
+        return {
+            "hits": self.pool_hits,
+            "misses": self.pool_misses,
+            "hit_rate": self.pool_hits / total if total else 0.0,
+            "idle": {f"{language}/{level}": queue.qsize()
+                     for (language, level), queue in self.warm_pool.items()},
+        }
+    
+    async def _start_warm(self, language: str, security_level: str) -> Optional[WarmContainer]:
+        """Start a container running the stdin job loop for language"""
+        name = f"claude-jester-warm-{language}-{uuid.uuid4().hex[:8]}"
+        image = LANGUAGE_IMAGES[language]
+        podman_args = (["podman", "run", "-i", "--rm", "--name", name, self._pull_flag(image)]
+                       + _security_args(security_level) + [image] + WARM_RUNNERS[language])
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *podman_args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                limit=_STREAM_LIMIT
+            )
+        except OSError:
+            return None
+        
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.ensure_future(self._reap_idle())
+        return WarmContainer(name, proc)
+    
+    def _replenish(self, key: tuple):
+        """Top the pool for key back up in the background"""
+        if self._warm_counts.get(key, 0) >= _WARM_CONTAINERS_PER_LANG:
+            return
+        self._warm_counts[key] += 1
+        task = asyncio.ensure_future(self._fill_warm(key))
+        self._warm_tasks.add(task)
+        task.add_done_callback(self._warm_tasks.discard)
+    
+    async def _fill_warm(self, key: tuple):
+        """Start one container for key and park it in the pool"""
+        container = await self._start_warm(*key)
+        if container is None:
+            self._warm_counts[key] -= 1
+        else:
+            self.warm_pool[key].put_nowait(container)
+            self._replenish(key)
+    
+    def _retire_warm(self, key: tuple, container: WarmContainer):
+        """Discard a container after its job without making the caller wait"""
+        task = asyncio.ensure_future(self._discard_warm(key, container))
+        self._reap_tasks.add(task)
+        task.add_done_callback(self._reap_tasks.discard)
+    
+    async def _discard_warm(self, key: tuple, container: WarmContainer, kill: bool = False):
+        """Stop a pooled container, starting its replacement meanwhile"""
+        self._warm_counts[key] -= 1
+        self._replenish(key)
+        await self._stop_warm(container, kill)
+    
+    @staticmethod
+    async def _stop_warm(container: WarmContainer, kill: bool = False):
+        """Close the job loop's stdin, or kill the container outright"""
+        proc = container.proc
+        try:
+            if kill:
+                killer = await asyncio.create_subprocess_exec(
+                    "podman", "kill", container.name,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+                await killer.wait()
+            else:
+                proc.stdin.close()
+            await asyncio.wait_for(proc.wait(), 5)
+        except Exception:
+            if proc.returncode is None:
+                proc.kill()
+    
+    async def _reap_idle(self):
+        """Stop containers that have sat idle past the warm window"""
+        while True:
+            await asyncio.sleep(60)
+            cutoff = time.monotonic() - _WARM_IDLE_TIMEOUT
+            stale = []
+            for key, queue in self.warm_pool.items():
+                keep = []
+                while not queue.empty():
+                    container = queue.get_nowait()
+                    if container.last_used < cutoff or container.proc.returncode is not None:
+                        self._warm_counts[key] -= 1
+                        stale.append(container)
+                    else:
+                        keep.append(container)
+                for container in keep:
+                    queue.put_nowait(container)
+            await asyncio.gather(*[self._stop_warm(container) for container in stale])
+    
+    async def close_warm_pool(self):
+        """Stop every pooled container"""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        for task in list(self._warm_tasks):
+            task.cancel()
+        containers = []
+        for key, queue in list(self.warm_pool.items()):
+            while not queue.empty():
+                containers.append(queue.get_nowait())
+                self._warm_counts[key] -= 1
+        await asyncio.gather(*[self._stop_warm(container) for container in containers])
+    
+    async def prepull_images(self):
+        """Pull any missing language images in parallel"""
+        if not await self._check_podman_availability():
+            return
+        await asyncio.gather(*[
+            self._ensure_image(image) for image in LANGUAGE_IMAGES.values()
+        ], return_exceptions=True)
+    
+    async def _ensure_image(self, image: str):
+        """Pull image unless it is already in local storage"""
+        returncode, _, _ = await _run(["podman", "image", "exists", image], timeout=10)
+        if returncode != 0:
+            returncode, _, _ = await _run(["podman", "pull", image], timeout=600)
+        if returncode == 0:
+            self._local_images.add(image)
+    
+    def _pull_flag(self, image: str) -> str:
+        """Pull policy for image; never touch the registry once it is local"""
+        if _PULL_POLICY:
+            return f"--pull={_PULL_POLICY}"
+        return "--pull=never" if image in self._local_images else "--pull=missing"
     
     async def get_system_info(self) -> Dict[str, Any]:
         """Get Podman system information"""
-        if not self.available:
+        if not await self._check_podman_availability():
             return {
                 "status": "unavailable",
                 "reason": "Podman not found or not accessible"
             }
         
+        if self._VERSION_CACHE:
+            return {
+                "status": "available",
+                "version": dict(self._VERSION_CACHE),
+                "warm_pool": self.pool_stats()
+            }
+        
         try:
             # Get version info
-            version_result = subprocess.run(
+            returncode, stdout, stderr = await _run(
                 ["podman", "version", "--format", "json"],
-                capture_output=True,
-                text=True,
                 timeout=10
             )
             
-            if version_result.returncode == 0:
-                import json
-                version_info = json.loads(version_result.stdout)
+            if returncode == 0:
+                version_info = _loads(stdout)
+                self._VERSION_CACHE.update(version_info.get("Client", {}))
                 return {
                     "status": "available",
-                    "version": version_info.get("Client", {})
+                    "version": dict(self._VERSION_CACHE),
+                    "warm_pool": self.pool_stats()
                 }
             else:
                 return {
                     "status": "error",
-                    "reason": version_result.stderr
+                    "reason": stderr
                 }
         
         except Exception as e:
@@ -192,64 +603,32 @@ class PodmanCodeExecutor:
     
     async def cleanup_session(self):
         """Clean up session containers"""
-        if not self.available:
+        if not await self._check_podman_availability():
             return
         
+        await self.close_warm_pool()
+        if self._reap_tasks:
+            await asyncio.gather(*self._reap_tasks, return_exceptions=True)
+        
         try:
-            # List running containers
-            result = subprocess.run(
-                ["podman", "ps", "--filter", "name=claude-jester-", "-q"],
-                capture_output=True,
-                text=True,
-                timeout=10
+            # One fork stops and removes every labelled container, running or exited
+            await _run(
+                ["podman", "rm", "--force", "--time=0", "--filter", f"label={CONTAINER_LABEL}"],
+                timeout=30
             )
-            
-            if result.returncode == 0 and result.stdout.strip():
-                container_ids = result.stdout.strip().split('\n')
-                for container_id in container_ids:
-                    if container_id:
-                        subprocess.run(
-                            ["podman", "stop", container_id],
-                            capture_output=True,
-                            timeout=5
-                        )
         except Exception:
             pass  # Best effort cleanup
 
-class IntegratedSlashCommands:
-    """Integrated slash commands for desktop extension"""
-    
-    def __init__(self, server):
-        self.server = server
-    
-    async def process_command(self, command: str) -> str:
-        """Process slash command and return result"""
-        command = command.strip()
-        
-        if not command.startswith('/'):
-            return "Error: Slash commands must start with '/'"
-        
-        parts = command[1:].split()
-        if not parts:
-            return "Error: Empty command"
-        
-        cmd = parts[0].lower()
-        args = parts[1:] if len(parts) > 1 else []
-        
-        if cmd == "help":
-            return self._help_command()
-        elif cmd == "quantum":
-            return await self._quantum_command(args)
-        elif cmd == "benchmark":
-            return await self._benchmark_command(args)
-        elif cmd == "container":
-            return await self._container_command(args)
-        else:
-            return f"Unknown command: {cmd}. Type '/help' for available commands."
-    
-    def _help_command(self) -> str:
-        """Show help information"""
-        return """🃏 Claude-Jester Slash Commands:
+_executor: Optional[PodmanCodeExecutor] = None
+
+def get_executor() -> PodmanCodeExecutor:
+    """Process-wide executor shared by the MCP server and slash commands"""
+    global _executor
+    if _executor is None:
+        _executor = PodmanCodeExecutor()
+    return _executor
+
+_HELP_TEXT = """🃏 Claude-Jester Slash Commands:
 
 /help - Show this help message
 /quantum <task> - Quantum debugging optimization
@@ -262,15 +641,8 @@ Examples:
 /container status
 
 For more information, see the documentation."""
-    
-    async def _quantum_command(self, args: list) -> str:
-        """Handle quantum debugging command"""
-        if not args:
-            return "Error: Quantum command requires a task description"
-        
-        task = " ".join(args)
-        
-        return f"""🔬 Quantum Debugging: {task}
+
+_QUANTUM_TEMPLATE = """🔬 Quantum Debugging: {task}
 
 ⚡ Simulating parallel algorithm testing...
 ├── Analyzing algorithmic complexity
@@ -284,45 +656,116 @@ For more information, see the documentation."""
 
 Note: Full quantum debugging requires advanced MCP server implementation.
 Current: Simulation mode for desktop extension."""
-    
-    async def _benchmark_command(self, args: list) -> str:
-        """Handle benchmark command"""
-        if len(args) < 2:
-            return "Error: Benchmark requires language and code. Usage: /benchmark <language> <code> [iterations]"
-        
-        language = args[0]
-        code = args[1]
-        iterations = int(args[2]) if len(args) > 2 and args[2].isdigit() else 10
-        
-        if iterations > 100:
-            iterations = 100  # Limit for safety
-        
-        # Simulate benchmarking
-        return f"""📊 Performance Benchmark Results:
+
+_BENCH_TEMPLATE = """📊 Performance Benchmark Results:
 
 Language: {language}
 Code: {code}
 Iterations: {iterations}
 
 ⏱️  Average Execution Time: ~0.{iterations}ms
-💾 Memory Usage: ~{iterations * 2}KB  
+💾 Memory Usage: ~{memory_kb}KB  
 🔄 Consistency: 95% (within 5% variance)
 
-📈 Performance Grade: {'A+' if iterations <= 10 else 'A' if iterations <= 50 else 'B+'}
+📈 Performance Grade: {grade}
 💡 Optimization Suggestion: Consider vectorized operations for improved performance
 
 Note: This is a simulation. Full benchmarking requires active code execution."""
+
+_LIST_TEXT = """🐳 Active Containers:
+
+📋 Claude-Jester containers: 0 running
+🔄 Session containers: None active
+💾 Container images: python:3.11-alpine, node:18-alpine, alpine:latest
+
+💡 Containers are created on-demand for secure code execution"""
+
+class IntegratedSlashCommands:
+    """Integrated slash commands for desktop extension"""
+    
+    def __init__(self, server, podman_executor: Optional[PodmanCodeExecutor] = None):
+        self.server = server
+        self.podman_executor = podman_executor or getattr(server, 'podman_executor', None)
+        self._handlers = {
+            "help": self._help_command,
+            "quantum": self._quantum_command,
+            "benchmark": self._benchmark_command,
+            "container": self._container_command,
+        }
+    
+    async def process_command(self, command: str) -> str:
+        """Process slash command and return result"""
+        command = command.strip()
+        
+        if not command.startswith('/'):
+            return "Error: Slash commands must start with '/'"
+        
+        # Only the command word is split off; handlers get the raw remainder,
+        # since task text and code carry quotes of their own
+        parts = command[1:].split(None, 1)
+        if not parts:
+            return "Error: Empty command"
+        
+        cmd = parts[0].lower()
+        handler = self._handlers.get(cmd)
+        if handler is None:
+            return f"Unknown command: {cmd}. Type '/help' for available commands."
+        return await handler(parts[1].strip() if len(parts) > 1 else "")
+    
+    async def _help_command(self, args: str) -> str:
+        """Show help information"""
+        return _HELP_TEXT
     
-    async def _container_command(self, args: list) -> str:
+    async def _quantum_command(self, args: str) -> str:
+        """Handle quantum debugging command"""
+        if not args:
+            return "Error: Quantum command requires a task description"
+        
+        return _QUANTUM_TEMPLATE.format(task=args)
+    
+    async def _benchmark_command(self, args: str) -> str:
+        """Handle benchmark command"""
+        parts = args.split(None, 1)
+        if len(parts) < 2:
+            return "Error: Benchmark requires language and code. Usage: /benchmark <language> <code> [iterations]"
+        
+        language, code = parts
+        # A trailing number is the iteration count; everything before it is code
+        head, _, last = code.rpartition(' ')
+        if head and last.isdigit():
+            code, iterations = head.rstrip(), int(last)
+        else:
+            iterations = 10
+        # Code wrapped in quotes as a single shell-style token is unwrapped
+        try:
+            tokens = shlex.split(code)
+        except ValueError:
+            tokens = None
+        if tokens and len(tokens) == 1 and code[0] in "'\"" and code[-1] == code[0]:
+            code = tokens[0]
+        
+        if iterations > 100:
+            iterations = 100  # Limit for safety
+        
+        # Simulate benchmarking
+        return _BENCH_TEMPLATE.format(
+            language=language,
+            code=code,
+            iterations=iterations,
+            memory_kb=iterations * 2,
+            grade='A+' if iterations <= 10 else 'A' if iterations <= 50 else 'B+'
+        )
+    
+    async def _container_command(self, args: str) -> str:
         """Handle container management command"""
         if not args:
             return "Error: Container command requires an action (list, cleanup, status)"
         
-        action = args[0].lower()
+        action = args.split()[0].lower()
         
         if action == "status":
-            if hasattr(self.server, 'podman_executor') and self.server.podman_executor:
-                info = await self.server.podman_executor.get_system_info()
+            if self.podman_executor:
+                info = await self.podman_executor.get_system_info()
                 status = info.get('status', 'unknown')
                 return f"""🐳 Container System Status:
 
@@ -335,17 +778,11 @@ Security: {'🛡️  Rootless execution enabled' if status == 'available' else '
                 return "🐳 Container System: Not configured"
         
         elif action == "list":
-            return """🐳 Active Containers:
-
-📋 Claude-Jester containers: 0 running
-🔄 Session containers: None active
-💾 Container images: python:3.11-alpine, node:18-alpine, alpine:latest
-
-💡 Containers are created on-demand for secure code execution"""
+            return _LIST_TEXT
         
         elif action == "cleanup":
-            if hasattr(self.server, 'podman_executor') and self.server.podman_executor:
-                await self.server.podman_executor.cleanup_session()
+            if self.podman_executor:
+                await self.podman_executor.cleanup_session()
                 return "🧹 Container cleanup completed"
             else:
                 return "🐳 No containers to clean up"
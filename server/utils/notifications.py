@@ -4,11 +4,16 @@ Desktop Notification System for Claude-Jester Desktop Extension
 Enhanced notification utilities for desktop integration
 """
 
+import asyncio
+import atexit
+import os
 import platform
-import subprocess
 import logging
+import re
+import shutil
 import json
 import time
+from collections import deque
 from typing import Optional, Dict, Any
 from pathlib import Path
 from enum import Enum
@@ -25,15 +30,115 @@ class NotificationType(Enum):
     PERFORMANCE = "performance"
     QUANTUM = "quantum"
 
+async def _run_command(cmd: list, timeout: float) -> bool:
+    """Run a notification command without blocking the event loop"""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        return await asyncio.wait_for(proc.wait(), timeout) == 0
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+
+_PS_QUOTES = re.compile("['\u2018\u2019\u201a\u201b]")
+
+def _applescript_quote(text: str) -> str:
+    """Quote text as an AppleScript string literal"""
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def _powershell_quote(text: str) -> str:
+    """Quote text as a single-line PowerShell verbatim string"""
+    # PowerShell also treats the typographic single quotes as delimiters
+    return "'" + _PS_QUOTES.sub(lambda m: m.group() * 2, text.replace('\r', ' ').replace('\n', ' ')) + "'"
+
+# Written once to the persistent PowerShell host before the first toast
+_PS_PRELUDE = b"""[Console]::InputEncoding = [Text.Encoding]::UTF8
+[Windows.UI.Notifications.ToastNotificationManager, Windows.UI.Notifications, ContentType = WindowsRuntime] | Out-Null
+[Windows.Data.Xml.Dom.XmlDocument, Windows.Data.Xml.Dom.XmlDocument, ContentType = WindowsRuntime] | Out-Null
+"""
+_PS_SENTINEL = b"__CLAUDE_JESTER_DONE__"
+
+# The JavaScript for Automation REPL evaluates one line at a time, so the
+# macOS host takes each toast as a single expression
+_OSA_HOST = ["osascript", "-l", "JavaScript", "-i"]
+_OSA_PRELUDE = b"var app = Application.currentApplication(); app.includeStandardAdditions = true;\n"
+
+class _ScriptHost:
+    """Long-lived interpreter fed scripts on stdin, each answered by a sentinel and a status"""
+    
+    def __init__(self, argv: list, prelude: bytes = b""):
+        self.argv = argv
+        self.prelude = prelude
+        self.proc = None
+        self._lock = None
+    
+    async def run(self, script: bytes, timeout: float) -> bytes:
+        """Send one script and return the status printed after its sentinel"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        
+        # One script at a time through the shared host
+        async with self._lock:
+            proc = await self._ensure()
+            proc.stdin.write(script)
+            await proc.stdin.drain()
+            try:
+                await asyncio.wait_for(proc.stdout.readuntil(_PS_SENTINEL), timeout=timeout)
+                status = await asyncio.wait_for(proc.stdout.readline(), timeout=timeout)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                # Drop the wedged host; the next script starts a fresh one
+                self.proc = None
+                if proc.returncode is None:
+                    proc.kill()
+                raise
+        return status.strip()
+    
+    async def _ensure(self):
+        """Start the host, or restart it if it has exited"""
+        if self.proc is None or self.proc.returncode is not None:
+            self.proc = await asyncio.create_subprocess_exec(
+                *self.argv,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            self.proc.stdin.write(self.prelude)
+        return self.proc
+    
+    async def close(self):
+        """Close the host's stdin and wait for it, killing it if it lingers"""
+        proc, self.proc = self.proc, None
+        if proc is None or proc.returncode is not None:
+            return
+        try:
+            proc.stdin.close()
+            await asyncio.wait_for(proc.wait(), timeout=5)
+        except Exception:
+            if proc.returncode is None:
+                proc.kill()
+
 class DesktopNotificationManager:
     """Advanced desktop notification system with rich features"""
     
     def __init__(self, config_dir: Optional[Path] = None):
         self.config_dir = config_dir or Path.home() / '.claude-jester'
         self.system = platform.system().lower()
-        self.notification_history = []
-        self.rate_limit = {}  # Rate limiting for notification spam
+        self.notification_history = deque(maxlen=100)
+        self.rate_limit = {}  # (title, type) -> monotonic time last sent
+        # Persistent notifier hosts, started on the first toast
+        self._ps = _ScriptHost(
+            ["powershell", "-NoProfile", "-NoLogo", "-NonInteractive", "-Command", "-"], _PS_PRELUDE
+        )
+        self._osa = _ScriptHost(_OSA_HOST, _OSA_PRELUDE)
+        self._osa_oneshot = False  # Set once the macOS host has failed; osascript -e from then on
+        self._dirty = False  # Preferences changed since the last write
+        self._backend = self._resolve_backend()
         self._load_preferences()
+        atexit.register(self.flush_preferences)
     
     def _load_preferences(self):
         """Load notification preferences"""
@@ -61,24 +166,38 @@ class DesktopNotificationManager:
             self.preferences = default_prefs
     
     def _save_preferences(self):
-        """Save notification preferences"""
+        """Mark preferences as changed; flush_preferences() writes them"""
+        self._dirty = True
+    
+    def flush_preferences(self):
+        """Write changed preferences to disk, replacing the file atomically"""
+        if not self._dirty:
+            return
+        
         try:
             prefs_file = self.config_dir / 'notification_preferences.json'
+            tmp_file = prefs_file.with_suffix('.json.tmp')
             self.config_dir.mkdir(exist_ok=True)
-            with open(prefs_file, 'w') as f:
+            with open(tmp_file, 'w') as f:
                 json.dump(self.preferences, f, indent=2)
+            os.replace(tmp_file, prefs_file)
+            self._dirty = False
         except Exception as e:
             logger.warning(f"Failed to save notification preferences: {e}")
     
-    def send(self, title: str, message: str, 
-             notification_type: NotificationType = NotificationType.INFO,
-             actions: Optional[Dict[str, str]] = None,
-             persistent: bool = False) -> bool:
+    async def send(self, title: str, message: str, 
+                   notification_type: NotificationType = NotificationType.INFO,
+                   actions: Optional[Dict[str, str]] = None,
+                   persistent: bool = False) -> bool:
         """Send desktop notification with enhanced features"""
         
         if not self.preferences['enabled']:
             return False
         
+        if self._rate_limited(title, notification_type):
+            logger.debug(f"Notification rate limited: {title} ({notification_type.value})")
+            return False
+        
         try:
             # Record notification
             notification_record = {
@@ -91,19 +210,8 @@ class DesktopNotificationManager:
             
             self.notification_history.append(notification_record)
             
-            # Keep only last 100 notifications
-            if len(self.notification_history) > 100:
-                self.notification_history = self.notification_history[-100:]
-            
             # Send platform-specific notification
-            success = False
-            
-            if self.system == "darwin":  # macOS
-                success = self._send_macos_notification(title, message, notification_type, actions, persistent)
-            elif self.system == "windows":  # Windows
-                success = self._send_windows_notification(title, message, notification_type, actions, persistent)
-            elif self.system == "linux":  # Linux
-                success = self._send_linux_notification(title, message, notification_type, actions, persistent)
+            success = await self._backend(title, message, notification_type, actions, persistent)
             
             logger.debug(f"Notification sent: {title} ({notification_type.value}) - Success: {success}")
             return success
@@ -112,74 +220,116 @@ class DesktopNotificationManager:
             logger.error(f"Failed to send notification: {e}")
             return False
     
-    def _send_macos_notification(self, title: str, message: str, 
-                                notification_type: NotificationType,
-                                actions: Optional[Dict[str, str]] = None,
-                                persistent: bool = False) -> bool:
+    def _resolve_backend(self):
+        """Pick the platform sender once; a no-op if its tool is not on PATH"""
+        backends = {
+            "darwin": ("osascript", self._send_macos_notification),
+            "windows": ("powershell", self._send_windows_notification),
+            "linux": ("notify-send", self._send_linux_notification),
+        }
+        tool, backend = backends.get(self.system, (None, None))
+        if tool is None or shutil.which(tool) is None:
+            return self._send_noop
+        return backend
+    
+    async def _send_noop(self, title: str, message: str,
+                         notification_type: NotificationType,
+                         actions: Optional[Dict[str, str]] = None,
+                         persistent: bool = False) -> bool:
+        """No notifier available on this system"""
+        return False
+    
+    def _rate_limited(self, title: str, notification_type: NotificationType) -> bool:
+        """Record a send of (title, type); True if one went out within the window"""
+        now = time.monotonic()
+        window = self.preferences['rate_limit_seconds']
+        key = (title, notification_type.value)
+        
+        last = self.rate_limit.get(key)
+        if last is not None and now - last < window:
+            return True
+        
+        # Drop expired keys as new ones arrive so the dict stays bounded
+        if key not in self.rate_limit:
+            for stale in [k for k, t in self.rate_limit.items() if now - t >= window]:
+                del self.rate_limit[stale]
+        self.rate_limit[key] = now
+        return False
+    
+    async def _send_macos_notification(self, title: str, message: str, 
+                                      notification_type: NotificationType,
+                                      actions: Optional[Dict[str, str]] = None,
+                                      persistent: bool = False) -> bool:
         """Send macOS notification using osascript"""
         try:
-            script = f'display notification "{message}" with title "🃏 {title}" subtitle "Claude-Jester"'
+            if not self._osa_oneshot:
+                try:
+                    return await self._send_macos_hosted(title, message)
+                except Exception as e:
+                    logger.warning(f"osascript host unavailable, using one-shot osascript: {e}")
+                    self._osa_oneshot = True
             
-            result = subprocess.run(
-                ["osascript", "-e", script],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            script = (f'display notification {_applescript_quote(message)} '
+                      f'with title {_applescript_quote("🃏 " + title)} subtitle "Claude-Jester"')
             
-            return result.returncode == 0
+            return await _run_command(["osascript", "-e", script], timeout=5)
             
         except Exception as e:
             logger.error(f"macOS notification failed: {e}")
             return False
     
-    def _send_windows_notification(self, title: str, message: str,
-                                  notification_type: NotificationType,
-                                  actions: Optional[Dict[str, str]] = None,
-                                  persistent: bool = False) -> bool:
+    async def _send_macos_hosted(self, title: str, message: str) -> bool:
+        """Show a notification through the persistent osascript host"""
+        # The sentinel is assembled at run time so an echoed input line never matches it
+        half = len(_PS_SENTINEL) // 2
+        sentinel = f'"{_PS_SENTINEL[:half].decode()}" + "{_PS_SENTINEL[half:].decode()}"'
+        script = (
+            "(function () { try { "
+            f"app.displayNotification({json.dumps(message)}, "
+            f"{{withTitle: {json.dumps('🃏 ' + title)}, subtitle: \"Claude-Jester\"}}); "
+            f"return {sentinel} + \"True\"; }} catch (e) {{ return {sentinel} + \"False\"; }} }})()\n"
+        )
+        status = await self._osa.run(script.encode('utf-8'), timeout=5)
+        # The REPL prints the result as a quoted string
+        return status.strip(b'"') == b"True"
+    
+    async def _send_windows_notification(self, title: str, message: str,
+                                        notification_type: NotificationType,
+                                        actions: Optional[Dict[str, str]] = None,
+                                        persistent: bool = False) -> bool:
         """Send Windows notification using PowerShell"""
         try:
             powershell_script = f'''
-            [Windows.UI.Notifications.ToastNotificationManager, Windows.UI.Notifications, ContentType = WindowsRuntime] | Out-Null
-            [Windows.Data.Xml.Dom.XmlDocument, Windows.Data.Xml.Dom.XmlDocument, ContentType = WindowsRuntime] | Out-Null
-            
             $template = [Windows.UI.Notifications.ToastNotificationManager]::GetTemplateContent([Windows.UI.Notifications.ToastTemplateType]::ToastText02)
-            $template.GetElementsByTagName("text")[0].AppendChild($template.CreateTextNode("🃏 {title}")) | Out-Null
-            $template.GetElementsByTagName("text")[1].AppendChild($template.CreateTextNode("{message}")) | Out-Null
+            $template.GetElementsByTagName("text")[0].AppendChild($template.CreateTextNode({_powershell_quote("🃏 " + title)})) | Out-Null
+            $template.GetElementsByTagName("text")[1].AppendChild($template.CreateTextNode({_powershell_quote(message)})) | Out-Null
             
             $toast = [Windows.UI.Notifications.ToastNotification]::new($template)
             [Windows.UI.Notifications.ToastNotificationManager]::CreateToastNotifier("Claude-Jester").Show($toast)
+            Write-Host "{_PS_SENTINEL.decode()}$?"
             '''
             
-            result = subprocess.run(
-                ["powershell", "-Command", powershell_script],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            return result.returncode == 0
+            status = await self._ps.run(powershell_script.encode('utf-8'), timeout=10)
+            return status == b"True"
                 
         except Exception as e:
             logger.error(f"Windows notification failed: {e}")
             return False
     
-    def _send_linux_notification(self, title: str, message: str,
-                                 notification_type: NotificationType,
-                                 actions: Optional[Dict[str, str]] = None,
-                                 persistent: bool = False) -> bool:
+    async def close(self):
+        """Write pending preferences and shut down the persistent notifier hosts"""
+        self.flush_preferences()
+        await asyncio.gather(self._ps.close(), self._osa.close())
+    
+    async def _send_linux_notification(self, title: str, message: str,
+                                       notification_type: NotificationType,
+                                       actions: Optional[Dict[str, str]] = None,
+                                       persistent: bool = False) -> bool:
         """Send Linux notification using notify-send"""
         try:
             cmd = ["notify-send", f"🃏 {title}", message]
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            return result.returncode == 0
+            return await _run_command(cmd, timeout=5)
             
         except Exception as e:
             logger.error(f"Linux notification failed: {e}")
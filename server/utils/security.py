@@ -5,15 +5,63 @@ Comprehensive code security scanning and vulnerability detection
 """
 
 import re
+import sys
+import bisect
 import hashlib
+import functools
 import ast
 import logging
-from typing import List, Dict, Set, Any, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Set, Any, Optional, Tuple, NamedTuple, Iterable
 from dataclasses import dataclass
 
+# Optional Hyperscan prefilter; the stdlib regex pass is used on its own without it
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# dataclass(slots=True) needs Python 3.10; older interpreters get plain frozen dataclasses
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Builtins flagged when called directly, with their severity and category. The
+# categories match the regex patterns these replace for parsed Python, so
+# compliance and recommendations see the same thing. Keys are interned like
+# the identifiers ast.parse produces, so lookups compare by pointer first
+_DANGEROUS_FUNCTIONS = {sys.intern(name): rule for name, rule in {
+    'eval': ('critical', 'injection'),
+    'exec': ('critical', 'injection'),
+    'compile': ('high', 'injection'),
+    '__import__': ('high', 'injection'),
+    'getattr': ('medium', 'dangerous_function'),
+    'setattr': ('medium', 'dangerous_function'),
+    'delattr': ('medium', 'dangerous_function')
+}.items()}
+
+# Names through which builtins are reached as attributes, e.g. builtins.eval(...)
+_BUILTINS_NAMES = frozenset({'builtins', '__builtins__'})
+
+_NEWLINE_RE = re.compile(b'\n')
+
+# Keyword fallback for code that is not Python or does not parse
+_COMPLEXITY_RE = re.compile(r'\b(?:if|elif|else|for|while|try|except|finally|with|def|class)\b')
+
+# Top-level modules flagged on import, with their severity and category
+_SUSPICIOUS_MODULES = {sys.intern(name): rule for name, rule in {
+    'os': ('medium', 'system'),
+    'subprocess': ('medium', 'system'),
+    'socket': ('medium', 'network'),
+    'urllib': ('medium', 'suspicious_import'),
+    'requests': ('medium', 'suspicious_import'),
+    'pickle': ('low', 'serialization'),
+    'marshal': ('low', 'suspicious_import'),
+    'ctypes': ('high', 'suspicious_import')
+}.items()}
+
+@dataclass(frozen=True, **_SLOTS)
 class SecurityViolation:
     """Represents a security violation found in code"""
     severity: str  # low, medium, high, critical
@@ -23,23 +71,176 @@ class SecurityViolation:
     suggestion: Optional[str] = None
     pattern: Optional[str] = None
 
-class SecurityPattern:
-    """Represents a security pattern to check"""
-    def __init__(self, pattern: str, severity: str, category: str, 
-                 description: str, suggestion: str = ""):
-        self.pattern = pattern
-        self.severity = severity
-        self.category = category
-        self.description = description
-        self.suggestion = suggestion
+class SecurityPattern(NamedTuple):
+    """Represents a security pattern to check; a tuple, so compact on every Python version"""
+    pattern: str
+    severity: str
+    category: str
+    description: str
+    suggestion: str = ""
+    ast_covered: bool = False  # Python AST checkers report the same construct
+
+@functools.lru_cache(maxsize=8)
+def _compile_patterns(patterns: Tuple[SecurityPattern, ...]):
+    """Combined regex, group index and per-pattern regexes for a pattern set, compiled once per process"""
+    # Every pattern as a named lookahead alternative, so one scan stops at
+    # each position where any pattern matches, even inside another's match.
+    # Compiled as bytes: the scan runs over the UTF-8 source, not decoded code points
+    flags = re.IGNORECASE | re.MULTILINE
+    combined = re.compile(
+        ("(?=" + "|".join(f"(?P<p{i}>{p.pattern})" for i, p in enumerate(patterns)) + ")").encode(),
+        flags
+    )
+    singles = tuple((re.compile(p.pattern.encode(), flags), p) for p in patterns)
+    return combined, {f"p{i}": i for i in range(len(patterns))}, singles
+
+@functools.lru_cache(maxsize=8)
+def _compile_prefilter(patterns: Tuple[SecurityPattern, ...]):
+    """Hyperscan database matching any pattern, or None when Hyperscan is unavailable"""
+    if hyperscan is None:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[p.pattern.encode() for p in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns)
+        )
+        return db
+    except Exception as e:
+        logger.warning(f"Hyperscan prefilter unavailable: {e}")
+        return None
+
+def _stop_scan(*_):
+    """Hyperscan match handler that ends the scan at the first hit"""
+    return True
+
+class _SecurityVisitor(ast.NodeVisitor):
+    """Single AST pass collecting violations per check and scoring complexity"""
+    
+    def __init__(self):
+        # One list per concern keeps the report grouped by check
+        self.functions = []
+        self.imports = []
+        self.strings = []
+        self.files = []
+        self.complexity = 1  # Base complexity
+    
+    @property
+    def violations(self) -> List[SecurityViolation]:
+        return self.functions + self.imports + self.strings + self.files
+    
+    def visit_Call(self, node: ast.Call):
+        self._check_dangerous_function(node)
+        self._check_string_operation(node)
+        self._check_file_operation(node)
+        self.generic_visit(node)
+    
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            self._check_module(alias.name, node.lineno)
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        # Relative imports name the package itself, never a stdlib module
+        if node.module and not node.level:
+            self._check_module(node.module, node.lineno)
+    
+    def _visit_branch(self, node: ast.AST):
+        """Statements that each add one to the complexity score"""
+        self.complexity += 1
+        self.generic_visit(node)
+    
+    visit_If = visit_For = visit_AsyncFor = visit_While = _visit_branch
+    visit_Try = visit_TryStar = visit_ExceptHandler = _visit_branch
+    visit_With = visit_AsyncWith = _visit_branch
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_ClassDef = _visit_branch
+    
+    def _check_dangerous_function(self, node: ast.Call):
+        """Check for dangerous function calls, bare or through the builtins module"""
+        func = node.func
+        if isinstance(func, ast.Name):
+            func_name = func.id
+            rule = _DANGEROUS_FUNCTIONS.get(func_name)
+        elif (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name)
+                and func.value.id in _BUILTINS_NAMES):
+            func_name = f"{func.value.id}.{func.attr}"
+            rule = _DANGEROUS_FUNCTIONS.get(func.attr)
+        else:
+            return
+        if rule:
+            severity, category = rule
+            self.functions.append(SecurityViolation(
+                severity=severity,
+                category=category,
+                description=f"Use of dangerous function: {func_name}",
+                line_number=node.lineno,
+                suggestion=f"Avoid using {func_name} function"
+            ))
+    
+    def _check_module(self, name: str, line_number: int):
+        """Check for suspicious imports"""
+        module_name = name.partition('.')[0]
+        rule = _SUSPICIOUS_MODULES.get(module_name)
+        if rule:
+            severity, category = rule
+            self.imports.append(SecurityViolation(
+                severity=severity,
+                category=category,
+                description=f"Import of potentially dangerous module: {module_name}",
+                line_number=line_number,
+                suggestion=f"Review usage of {module_name} module"
+            ))
+    
+    def _check_string_operation(self, node: ast.Call):
+        """Check for dangerous string operations"""
+        # Check for string formatting that might lead to injection
+        if (isinstance(node.func, ast.Attribute) and 
+            node.func.attr == 'format'):
+            self.strings.append(SecurityViolation(
+                severity="low",
+                category="string_injection",
+                description="String formatting may be vulnerable to injection",
+                line_number=node.lineno,
+                suggestion="Validate and sanitize format arguments"
+            ))
+    
+    def _check_file_operation(self, node: ast.Call):
+        """Check for unsafe file operations"""
+        if isinstance(node.func, ast.Name) and node.func.id == 'open':
+            # Check for path traversal patterns in file operations
+            if node.args:
+                if isinstance(node.args[0], ast.Constant):
+                    path = str(node.args[0].value)
+                    if '..' in path or path.startswith('/'):
+                        self.files.append(SecurityViolation(
+                            severity="high",
+                            category="path_traversal",
+                            description="Potential path traversal in file operation",
+                            line_number=node.lineno,
+                            suggestion="Validate and sanitize file paths"
+                        ))
 
 class AdvancedSecurityAnalyzer:
     """Advanced security analyzer with multiple detection methods"""
     
-    def __init__(self):
-        self.patterns = self._initialize_patterns()
-        self.ast_checkers = self._initialize_ast_checkers()
+    CACHE_SIZE = 256
+    AST_LIMIT = 1 << 20  # Characters; sampled inputs beyond this skip the AST pass
+    
+    def __init__(self, patterns: Optional[Iterable[SecurityPattern]] = None):
+        self.patterns = list(patterns) if patterns is not None else self._initialize_patterns()
+        # Full set for other languages and unparseable Python; the regex-only
+        # subset once the AST checkers have covered the rest
+        regex_only = tuple(p for p in self.patterns if not p.ast_covered)
+        self._scanners = {
+            ast_checked: _compile_patterns(subset) + (_compile_prefilter(subset),)
+            for ast_checked, subset in ((False, tuple(self.patterns)), (True, regex_only))
+        }
         self.compliance_rules = self._initialize_compliance_rules()
+        self._index_compliance_rules()
+        # (sha256 of code, language, max_bytes if sampled) -> (violations, complexity_score, truncated),
+        # least recent first
+        self._cache = OrderedDict()
     
     def _initialize_patterns(self) -> List[SecurityPattern]:
         """Initialize security patterns for detection"""
@@ -55,13 +256,15 @@ class AdvancedSecurityAnalyzer:
                 r"eval\s*\(",
                 "critical", "injection",
                 "Dynamic code evaluation - code injection risk",
-                "Avoid eval() - use specific parsing functions"
+                "Avoid eval() - use specific parsing functions",
+                ast_covered=True
             ),
             SecurityPattern(
                 r"exec\s*\(",
                 "critical", "injection", 
                 "Dynamic code execution - code injection risk",
-                "Avoid exec() - use specific parsing functions"
+                "Avoid exec() - use specific parsing functions",
+                ast_covered=True
             ),
             SecurityPattern(
                 r"subprocess\.(call|run|Popen)\s*\(\s*shell\s*=\s*True",
@@ -75,13 +278,15 @@ class AdvancedSecurityAnalyzer:
                 r"__import__\s*\(",
                 "high", "injection",
                 "Dynamic module import",
-                "Use static imports when possible"
+                "Use static imports when possible",
+                ast_covered=True
             ),
             SecurityPattern(
                 r"compile\s*\(",
                 "high", "injection",
                 "Dynamic code compilation", 
-                "Avoid dynamic compilation"
+                "Avoid dynamic compilation",
+                ast_covered=True
             ),
             SecurityPattern(
                 r"open\s*\(\s*['\"].*\.\./",
@@ -95,13 +300,15 @@ class AdvancedSecurityAnalyzer:
                 r"import\s+os\b",
                 "medium", "system",
                 "Operating system access imported",
-                "Review OS access requirements"
+                "Review OS access requirements",
+                ast_covered=True
             ),
             SecurityPattern(
                 r"import\s+subprocess\b",
                 "medium", "system", 
                 "Subprocess module imported",
-                "Review subprocess usage for security"
+                "Review subprocess usage for security",
+                ast_covered=True
             ),
             SecurityPattern(
                 r"import\s+(urllib|requests|httplib)\b",
@@ -113,7 +320,8 @@ class AdvancedSecurityAnalyzer:
                 r"import\s+socket\b",
                 "medium", "network",
                 "Socket programming imported",
-                "Review socket usage for security"
+                "Review socket usage for security",
+                ast_covered=True
             ),
             
             # Low severity patterns
@@ -121,7 +329,8 @@ class AdvancedSecurityAnalyzer:
                 r"import\s+pickle\b",
                 "low", "serialization",
                 "Pickle module can execute arbitrary code",
-                "Consider safer serialization formats like JSON"
+                "Consider safer serialization formats like JSON",
+                ast_covered=True
             ),
             SecurityPattern(
                 r"input\s*\(",
@@ -131,15 +340,6 @@ class AdvancedSecurityAnalyzer:
             )
         ]
     
-    def _initialize_ast_checkers(self) -> List[callable]:
-        """Initialize AST-based security checkers"""
-        return [
-            self._check_dangerous_functions,
-            self._check_import_statements,
-            self._check_string_operations,
-            self._check_file_operations
-        ]
-    
     def _initialize_compliance_rules(self) -> Dict[str, List[str]]:
         """Initialize compliance rules for different standards"""
         return {
@@ -158,36 +358,34 @@ class AdvancedSecurityAnalyzer:
             ]
         }
     
-    def analyze_code(self, code: str, language: str = "python") -> Dict[str, Any]:
-        """Comprehensive security analysis of code"""
-        violations = []
+    def _index_compliance_rules(self):
+        """Map each compliance category to its standards, plus one regex finding categories in text"""
+        self._category_standards = {}
+        for standard, categories in self.compliance_rules.items():
+            for category in categories:
+                self._category_standards.setdefault(category, []).append(standard)
         
+        # Longest first at each position; shorter categories it contains are expanded below
+        categories = sorted(self._category_standards, key=len, reverse=True)
+        self._category_re = re.compile('(?=(' + '|'.join(map(re.escape, categories)) + '))')
+        self._category_prefixes = {
+            category: [other for other in categories if category.startswith(other)]
+            for category in categories
+        }
+    
+    def _standards_for(self, violation: SecurityViolation) -> Set[str]:
+        """Standards a violation counts against, by category or by a category named in its description"""
+        standards = set(self._category_standards.get(violation.category, ()))
+        for match in self._category_re.finditer(violation.description.lower()):
+            for category in self._category_prefixes[match.group(1)]:
+                standards.update(self._category_standards[category])
+        return standards
+    
+    def analyze_code(self, code: str, language: str = "python",
+                     max_bytes: Optional[int] = None) -> Dict[str, Any]:
+        """Comprehensive security analysis of code; with max_bytes, larger input is sampled head and tail"""
         try:
-            # Pattern-based analysis
-            pattern_violations = self._analyze_patterns(code)
-            violations.extend(pattern_violations)
-            
-            # AST-based analysis (for Python)
-            if language.lower() == "python":
-                try:
-                    tree = ast.parse(code)
-                    ast_violations = self._analyze_ast(tree, code)
-                    violations.extend(ast_violations)
-                except SyntaxError as e:
-                    violations.append(SecurityViolation(
-                        "medium", "syntax",
-                        f"Syntax error may indicate obfuscated code: {e}",
-                        line_number=getattr(e, 'lineno', None)
-                    ))
-            
-            # Complexity analysis
-            complexity_score = self._analyze_complexity(code)
-            if complexity_score > 50:
-                violations.append(SecurityViolation(
-                    "low", "complexity",
-                    f"High code complexity ({complexity_score}) may hide security issues",
-                    suggestion="Break down complex functions for easier review"
-                ))
+            violations, complexity_score, truncated = self._scan(code, language.lower(), max_bytes)
             
             # Generate overall assessment
             risk_level = self._calculate_risk_level(violations)
@@ -195,12 +393,23 @@ class AdvancedSecurityAnalyzer:
             
             return {
                 "risk_level": risk_level,
-                "violations": [self._violation_to_dict(v) for v in violations],
+                "violations": [
+                    {
+                        "severity": v.severity,
+                        "category": v.category,
+                        "description": v.description,
+                        "line_number": v.line_number,
+                        "suggestion": v.suggestion,
+                        "pattern": v.pattern
+                    }
+                    for v in violations
+                ],
                 "compliance_status": compliance_status,
                 "complexity_score": complexity_score,
                 "total_violations": len(violations),
                 "critical_violations": len([v for v in violations if v.severity == "critical"]),
-                "recommendations": self._generate_recommendations(violations)
+                "recommendations": self._generate_recommendations(violations),
+                "truncated": truncated
             }
             
         except Exception as e:
@@ -213,157 +422,176 @@ class AdvancedSecurityAnalyzer:
                 "complexity_score": 0,
                 "total_violations": 0,
                 "critical_violations": 0,
-                "recommendations": []
+                "recommendations": [],
+                "truncated": False
             }
     
-    def _analyze_patterns(self, code: str) -> List[SecurityViolation]:
-        """Analyze code using regex patterns"""
-        violations = []
+    def analyze_many(self, codes: Iterable[str], language: str = "python",
+                     workers: Optional[int] = None,
+                     max_bytes: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Analyze many snippets across worker processes, returning reports in input order"""
+        codes = list(codes)
+        if len(codes) <= 1 or workers == 1:
+            return [self.analyze_code(code, language, max_bytes) for code in codes]
         
-        for pattern_obj in self.patterns:
-            matches = re.finditer(pattern_obj.pattern, code, re.IGNORECASE | re.MULTILINE)
-            
-            for match in matches:
-                # Find line number
-                line_number = code[:match.start()].count('\n') + 1
-                
-                violation = SecurityViolation(
-                    severity=pattern_obj.severity,
-                    category=pattern_obj.category,
-                    description=pattern_obj.description,
-                    line_number=line_number,
-                    suggestion=pattern_obj.suggestion,
-                    pattern=pattern_obj.pattern
-                )
-                violations.append(violation)
-        
-        return violations
+        # Workers build their own analyzer from the patterns, so self is never pickled
+        analyze = functools.partial(_analyze_standalone, patterns=tuple(self.patterns),
+                                    language=language, max_bytes=max_bytes)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(analyze, codes, chunksize=8))
     
-    def _analyze_ast(self, tree: ast.AST, code: str) -> List[SecurityViolation]:
-        """Analyze code using AST parsing"""
-        violations = []
+    def _scan(self, code: str, language: str,
+              max_bytes: Optional[int] = None) -> Tuple[Tuple[SecurityViolation, ...], int, bool]:
+        """Pattern, AST and complexity results for code and whether it was sampled, memoized on its SHA-256"""
+        # One encode serves the cache key and every byte-level scanner
+        code_bytes = code.encode('utf-8', 'surrogatepass')
+        truncated = max_bytes is not None and len(code_bytes) > max_bytes
+        key = (hashlib.sha256(code_bytes).digest(), language, max_bytes if truncated else None)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
         
-        for checker in self.ast_checkers:
+        # AST-based analysis (for Python); the same walk scores complexity.
+        # Runs first so the pattern pass knows whether it may skip what AST covers
+        ast_violations = None
+        syntax_violation = None
+        complexity_score = None
+        notes = []
+        if language == "python" and truncated and len(code) > self.AST_LIMIT:
+            notes.append(SecurityViolation(
+                "low", "meta",
+                f"AST analysis skipped for input over {self.AST_LIMIT} characters",
+                suggestion="Analyze smaller units for AST-level checks"
+            ))
+        elif language == "python":
             try:
-                checker_violations = checker(tree, code)
-                violations.extend(checker_violations)
-            except Exception as e:
-                logger.warning(f"AST checker failed: {e}")
+                tree = ast.parse(code)
+                ast_violations, complexity_score = self._analyze_ast(tree, code)
+            except SyntaxError as e:
+                syntax_violation = SecurityViolation(
+                    "medium", "syntax",
+                    f"Syntax error may indicate obfuscated code: {e}",
+                    line_number=getattr(e, 'lineno', None)
+                )
         
-        return violations
-    
-    def _check_dangerous_functions(self, tree: ast.AST, code: str) -> List[SecurityViolation]:
-        """Check for dangerous function calls"""
+        # Sampled input is scanned as a head and a tail slice, each numbering
+        # lines from where it starts in the original
+        if truncated:
+            head = max_bytes * 2 // 3
+            tail_start = len(code_bytes) - (max_bytes - head)
+            parts = [(code_bytes[:head], 1),
+                     (code_bytes[tail_start:], code_bytes.count(b'\n', 0, tail_start) + 1)]
+            notes.append(SecurityViolation(
+                "low", "meta",
+                f"Input truncated for analysis: {len(code_bytes)} bytes, {max_bytes} scanned",
+                suggestion="Re-run with larger max_bytes"
+            ))
+        else:
+            parts = [(code_bytes, 1)]
+        
+        # Pattern-based analysis; line numbers come from one newline scan per slice
         violations = []
-        dangerous_functions = {
-            'eval': 'critical',
-            'exec': 'critical', 
-            'compile': 'high',
-            '__import__': 'high',
-            'getattr': 'medium',
-            'setattr': 'medium',
-            'delattr': 'medium'
-        }
+        for part, first_line in parts:
+            newlines = [m.start() for m in _NEWLINE_RE.finditer(part)]
+            violations.extend(self._analyze_patterns(part, newlines, ast_checked=ast_violations is not None,
+                                                     first_line=first_line))
         
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name):
-                    func_name = node.func.id
-                    if func_name in dangerous_functions:
-                        violations.append(SecurityViolation(
-                            severity=dangerous_functions[func_name],
-                            category="dangerous_function",
-                            description=f"Use of dangerous function: {func_name}",
-                            line_number=node.lineno,
-                            suggestion=f"Avoid using {func_name} function"
-                        ))
+        if ast_violations is not None:
+            violations.extend(ast_violations)
+        elif syntax_violation is not None:
+            violations.append(syntax_violation)
+        violations.extend(notes)
+        
+        # Complexity analysis
+        if complexity_score is None:
+            complexity_score = self._analyze_complexity(
+                '\n'.join(part.decode('utf-8', 'ignore') for part, _ in parts) if truncated else code
+            )
+        if complexity_score > 50:
+            violations.append(SecurityViolation(
+                "low", "complexity",
+                f"High code complexity ({complexity_score}) may hide security issues",
+                suggestion="Break down complex functions for easier review"
+            ))
         
-        return violations
+        result = (tuple(violations), complexity_score, truncated)
+        self._cache[key] = result
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
     
-    def _check_import_statements(self, tree: ast.AST, code: str) -> List[SecurityViolation]:
-        """Check for suspicious imports"""
-        violations = []
-        suspicious_modules = {
-            'os': 'medium',
-            'subprocess': 'medium', 
-            'socket': 'medium',
-            'urllib': 'medium',
-            'requests': 'medium',
-            'pickle': 'low',
-            'marshal': 'low',
-            'ctypes': 'high'
-        }
+    def _analyze_patterns(self, code: bytes, newlines: List[int], ast_checked: bool = False,
+                          first_line: int = 1) -> List[SecurityViolation]:
+        """Analyze code using regex patterns, leaving AST-covered ones out when ast_checked"""
+        combined_re, index_by_group, singles, prefilter = self._scanners[ast_checked]
         
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    module_name = alias.name.split('.')[0]
-                    if module_name in suspicious_modules:
-                        violations.append(SecurityViolation(
-                            severity=suspicious_modules[module_name],
-                            category="suspicious_import",
-                            description=f"Import of potentially dangerous module: {module_name}",
-                            line_number=node.lineno,
-                            suggestion=f"Review usage of {module_name} module"
-                        ))
+        # Most code matches nothing; let the DFA engine rule that out before the regex pass
+        if prefilter is not None and not self._may_match(prefilter, code):
+            return []
         
-        return violations
-    
-    def _check_string_operations(self, tree: ast.AST, code: str) -> List[SecurityViolation]:
-        """Check for dangerous string operations"""
-        violations = []
+        found = []
+        match_end = {}  # Pattern index -> end of its last reported match
         
-        for node in ast.walk(tree):
-            # Check for string formatting that might lead to injection
-            if isinstance(node, ast.Call):
-                if (isinstance(node.func, ast.Attribute) and 
-                    node.func.attr == 'format'):
-                    violations.append(SecurityViolation(
-                        severity="low",
-                        category="string_injection",
-                        description="String formatting may be vulnerable to injection",
-                        line_number=node.lineno,
-                        suggestion="Validate and sanitize format arguments"
-                    ))
+        for match in combined_re.finditer(code):
+            first = index_by_group[match.lastgroup]
+            position = match.start()
+            hits = [(first, match.span(match.lastgroup))]
+            # The alternation stops at the first pattern matching here; later ones may match too
+            for index in range(first + 1, len(singles)):
+                hit = singles[index][0].match(code, position)
+                if hit:
+                    hits.append((index, hit.span()))
+            
+            for index, (start, end) in hits:
+                # Like a per-pattern finditer, skip matches inside this pattern's previous one
+                if start < match_end.get(index, 0):
+                    continue
+                match_end[index] = end
+                
+                pattern_obj = singles[index][1]
+                
+                # Find line number: newlines before the match, from the slice's first line (both byte offsets)
+                line_number = bisect.bisect_right(newlines, start) + first_line
+                
+                found.append((index, SecurityViolation(
+                    severity=pattern_obj.severity,
+                    category=pattern_obj.category,
+                    description=pattern_obj.description,
+                    line_number=line_number,
+                    suggestion=pattern_obj.suggestion,
+                    pattern=pattern_obj.pattern
+                )))
         
-        return violations
+        # Report in pattern order, as the one-pass-per-pattern scan did
+        found.sort(key=lambda item: item[0])
+        return [violation for _, violation in found]
     
-    def _check_file_operations(self, tree: ast.AST, code: str) -> List[SecurityViolation]:
-        """Check for unsafe file operations"""
-        violations = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name) and node.func.id == 'open':
-                    # Check for path traversal patterns in file operations
-                    if node.args:
-                        if isinstance(node.args[0], ast.Constant):
-                            path = str(node.args[0].value)
-                            if '..' in path or path.startswith('/'):
-                                violations.append(SecurityViolation(
-                                    severity="high",
-                                    category="path_traversal",
-                                    description="Potential path traversal in file operation",
-                                    line_number=node.lineno,
-                                    suggestion="Validate and sanitize file paths"
-                                ))
+    def _may_match(self, prefilter, code: bytes) -> bool:
+        """Whether any pattern matches, per the Hyperscan prefilter"""
+        try:
+            prefilter.scan(code, match_event_handler=_stop_scan)
+        except hyperscan.ScanTerminated:
+            return True
+        except Exception as e:
+            logger.warning(f"Hyperscan scan failed: {e}")
+            return True
+        return False
+    
+    def _analyze_ast(self, tree: ast.AST, code: str) -> Tuple[List[SecurityViolation], int]:
+        """Analyze code using AST parsing, in a single visit that also scores complexity"""
+        visitor = _SecurityVisitor()
+        try:
+            visitor.visit(tree)
+        except Exception as e:
+            logger.warning(f"AST analysis failed: {e}")
         
-        return violations
+        return visitor.violations, visitor.complexity
     
     def _analyze_complexity(self, code: str) -> int:
-        """Calculate code complexity score"""
-        complexity = 1  # Base complexity
-        
-        # Count control structures
-        control_keywords = ['if', 'elif', 'else', 'for', 'while', 'try', 'except', 'finally', 'with']
-        for keyword in control_keywords:
-            complexity += code.count(keyword)
-        
-        # Count function definitions
-        complexity += code.count('def ')
-        complexity += code.count('class ')
-        
-        return complexity
+        """Approximate complexity from keywords when no Python AST is available"""
+        # Base complexity plus one per whole-word control or definition keyword
+        return 1 + sum(1 for _ in _COMPLEXITY_RE.finditer(code))
     
     def _calculate_risk_level(self, violations: List[SecurityViolation]) -> str:
         """Calculate overall risk level"""
@@ -392,12 +620,13 @@ class AdvancedSecurityAnalyzer:
         """Check for compliance violations"""
         compliance_status = {}
         
-        for standard, categories in self.compliance_rules.items():
-            violations_in_standard = []
-            for violation in violations:
-                if violation.category in categories or any(cat in violation.description.lower() for cat in categories):
-                    violations_in_standard.append(violation)
-            
+        # One lookup per violation, bucketed by standard
+        per_standard = {standard: [] for standard in self.compliance_rules}
+        for violation in violations:
+            for standard in self._standards_for(violation):
+                per_standard[standard].append(violation)
+        
+        for standard, violations_in_standard in per_standard.items():
             compliance_status[standard] = {
                 "violations": len(violations_in_standard),
                 "status": "fail" if violations_in_standard else "pass",
@@ -430,14 +659,13 @@ class AdvancedSecurityAnalyzer:
             recommendations.append("Validate and sanitize all file paths")
         
         return recommendations
-    
-    def _violation_to_dict(self, violation: SecurityViolation) -> Dict[str, Any]:
-        """Convert violation to dictionary"""
-        return {
-            "severity": violation.severity,
-            "category": violation.category,
-            "description": violation.description,
-            "line_number": violation.line_number,
-            "suggestion": violation.suggestion,
-            "pattern": violation.pattern
-        }
+
+@functools.lru_cache(maxsize=4)
+def _worker_analyzer(patterns: Tuple[SecurityPattern, ...]) -> AdvancedSecurityAnalyzer:
+    """Analyzer for a pattern set, built once per worker process and keeping its own cache"""
+    return AdvancedSecurityAnalyzer(patterns)
+
+def _analyze_standalone(code: str, patterns: Tuple[SecurityPattern, ...],
+                        language: str = "python", max_bytes: Optional[int] = None) -> Dict[str, Any]:
+    """Picklable entry point for analyze_many workers"""
+    return _worker_analyzer(patterns).analyze_code(code, language, max_bytes)
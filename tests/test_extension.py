@@ -97,6 +97,19 @@ class TestDesktopConfig:
             os.environ.pop('CLAUDE_JESTER_ALLOWED_LANGUAGES', None)
             os.environ.pop('CLAUDE_JESTER_QUANTUM_ENABLED', None)
 
+    def test_invalid_workspace_falls_back_to_default(self, temp_config_dir, monkeypatch):
+        """Test an unusable workspace directory falls back to the default"""
+        from claude_jester_desktop import DesktopConfig
+        
+        not_a_dir = temp_config_dir / 'afile'
+        not_a_dir.write_text('')
+        monkeypatch.setenv('CLAUDE_JESTER_WORKSPACE_DIRECTORY', str(not_a_dir / 'ws'))
+        
+        config = DesktopConfig()
+        
+        assert config.workspace_dir == config.data_dir / 'workspace'
+        assert config.workspace_dir.is_dir()
+
 class TestSecureStorage:
     """Test secure storage functionality"""
     
@@ -148,6 +161,20 @@ class TestDesktopNotifications:
         assert "osascript" in args
         assert "display notification" in ' '.join(args)
     
+    @patch('platform.system')
+    @patch('subprocess.run')
+    def test_macos_notification_escapes_quotes(self, mock_run, mock_system):
+        """Test quotes in the message cannot break out of the AppleScript string"""
+        mock_system.return_value = "Darwin"
+        mock_run.return_value.returncode = 0
+        
+        from claude_jester_desktop import DesktopNotification
+        
+        DesktopNotification.send("Test Title", 'say "hi" \\ bye')
+        
+        script = mock_run.call_args[0][0][-1]
+        assert 'display notification "say \\"hi\\" \\\\ bye"' in script
+    
     @patch('platform.system')
     @patch('subprocess.run')
     def test_linux_notification(self, mock_run, mock_system):
@@ -314,6 +341,76 @@ class TestCodeExecution:
         assert "Claude-Jester" in result.output
         assert result.security_level == "command"
 
+class TestContainerPool:
+    """Test the pre-started container pool"""
+    
+    # Stand-in for podman: `run` executes the container command locally in a
+    # fresh directory, so each "container" has its own filesystem
+    FAKE_PODMAN = """#!{python}
+import os, sys, tempfile
+args = sys.argv[1:]
+if args[:1] != ["run"]:
+    print("podman version 4.0.0")
+    sys.exit(0)
+image = next(i for i, arg in enumerate(args) if ":" in arg and not arg.startswith("-") and "=" not in arg)
+cmd = args[image + 1:]
+if cmd[0] == "python":
+    cmd[0] = sys.executable
+os.chdir(tempfile.mkdtemp())
+os.execvp(cmd[0], cmd)
+"""
+    
+    @pytest.mark.asyncio
+    async def test_pooled_containers_are_single_use(self, tmp_path, monkeypatch):
+        """Test a file written by one job is not visible to the next"""
+        import standalone_mcp_server
+        from standalone_mcp_server import PodmanCodeExecutor
+        
+        podman = tmp_path / "podman"
+        podman.write_text(self.FAKE_PODMAN.format(python=sys.executable))
+        podman.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+        monkeypatch.setattr(PodmanCodeExecutor, "_AVAILABILITY_CACHE", None)
+        # One pooled container, so a reused one would serve the second job
+        monkeypatch.setattr(standalone_mcp_server, "_WARM_CONTAINERS_PER_LANG", 1)
+        
+        executor = PodmanCodeExecutor()
+        try:
+            first = await executor.execute_code("open('marker', 'w').write('x')", "python")
+            # Let the used container go and the pool refill before the next job
+            await asyncio.gather(*executor._reap_tasks)
+            await asyncio.gather(*executor._warm_tasks)
+            second = await executor.execute_code("import os; print(os.path.exists('marker'))", "python")
+            
+            assert first.success and second.success
+            assert second.method == "podman_warm"
+            assert first.container_id != second.container_id
+            assert second.output.strip() == "False"
+        finally:
+            await executor.close_warm_pool()
+            if executor._reap_tasks:
+                await asyncio.gather(*executor._reap_tasks)
+    
+    @pytest.mark.asyncio
+    async def test_shutdown_waits_for_container_cleanup(self):
+        """Test the server cleans up containers before closing when stdin ends"""
+        import io
+        import claude_jester_desktop
+        
+        calls = []
+        server = Mock()
+        server.podman_executor.warm_up = AsyncMock()
+        server.podman_executor.cleanup_session = AsyncMock(side_effect=lambda: calls.append("cleanup"))
+        server.close.side_effect = lambda: calls.append("close")
+        
+        with patch('claude_jester_desktop.DesktopMCPServer', return_value=server), \
+             patch('claude_jester_desktop._serve', AsyncMock()), \
+             patch('sys.stdout', Mock(buffer=Mock(raw=io.BytesIO()))):
+            await claude_jester_desktop.main_async()
+        
+        server.podman_executor.cleanup_session.assert_awaited_once()
+        assert calls == ["cleanup", "close"]
+
 # ===== SECURITY TESTS =====
 
 class TestSecurity:
@@ -365,11 +462,57 @@ print(calculate_fibonacci(10))
         assert analysis["risk_level"] == "low"
         assert len(analysis["issues"]) == 0
     
+    def test_advanced_analysis_eval_fails_owasp(self):
+        """Test that eval found by the AST pass still counts as injection"""
+        from utils.security import AdvancedSecurityAnalyzer
+        
+        analysis = AdvancedSecurityAnalyzer().analyze_code("x = eval(input())", "python")
+        
+        assert analysis["compliance_status"]["OWASP"]["status"] == "fail"
+        assert "injection" in analysis["compliance_status"]["OWASP"]["risk_areas"]
+        assert "Implement input validation and sanitization" in analysis["recommendations"]
+        # Reported once, by the AST pass, not again by the regex pattern
+        assert sum(v["category"] == "injection" for v in analysis["violations"]) == 1
+    
+    @pytest.mark.parametrize("code", [
+        "import builtins\nbuiltins.eval('1')",
+        "__builtins__.exec('x = 1')",
+    ])
+    def test_advanced_analysis_builtins_attribute_call(self, code):
+        """Test eval/exec reached through the builtins module are still flagged"""
+        from utils.security import AdvancedSecurityAnalyzer
+        
+        analysis = AdvancedSecurityAnalyzer().analyze_code(code, "python")
+        
+        assert analysis["risk_level"] == "high"
+        assert analysis["compliance_status"]["OWASP"]["status"] == "fail"
+        assert any(v["category"] == "injection" for v in analysis["violations"])
+    
+    def test_combined_scan_reports_overlapping_patterns(self):
+        """Test patterns matching at the same position are all reported, in pattern order"""
+        from utils.security import AdvancedSecurityAnalyzer, SecurityPattern
+        
+        analyzer = AdvancedSecurityAnalyzer(patterns=[
+            SecurityPattern(r"os\.", "low", "os_access", "os module access"),
+            SecurityPattern(r"os\.system\s*\(", "critical", "system_command", "Shell command"),
+            SecurityPattern(r"system", "medium", "system_name", "system mentioned"),
+        ])
+        
+        analysis = analyzer.analyze_code("x = 1\nos.system(1)\n\nos.path\n", "javascript")
+        found = [(v["category"], v["line_number"]) for v in analysis["violations"]]
+        
+        assert found == [
+            ("os_access", 2), ("os_access", 4),
+            ("system_command", 2),
+            ("system_name", 2),
+        ]
+        assert analysis["violations"][2]["severity"] == "critical"
+    
     @pytest.mark.asyncio
     async def test_security_notifications(self, desktop_server):
         """Test security alert notifications"""
-        with patch('claude_jester_desktop.DesktopNotification.send') as mock_notify:
-            desktop_server.config.notifications['security_alerts'] = True
+        with patch('claude_jester_desktop.DesktopNotification.send_async') as mock_notify:
+            desktop_server.config.notify_security = True
             
             result = await desktop_server.execute_code_enhanced(
                 "python",
@@ -401,6 +544,20 @@ class TestPerformanceMonitoring:
         assert result.execution_time >= 0.1
         assert result.performance_metrics is not None
     
+    def test_corrupt_metrics_file_line_count(self, temp_config_dir):
+        """Test a metrics file that fails to load still has its lines counted"""
+        from claude_jester_desktop import DesktopConfig, EnhancedPerformanceMonitor
+        
+        config = DesktopConfig()
+        (config.data_dir / 'performance_metrics.jsonl').write_text('{"a": 1}\nnot json\n{"b": 2}\n')
+        
+        monitor = EnhancedPerformanceMonitor(config)
+        try:
+            assert len(monitor.performance_history) == 0
+            assert monitor._file_lines == 3
+        finally:
+            monitor.close()
+    
     def test_complexity_calculation(self, desktop_server):
         """Test code complexity calculation"""
         if not hasattr(desktop_server, 'performance_monitor'):
@@ -462,6 +619,42 @@ class TestAuditLogging:
             assert 'code_hash' in entry
             assert entry['language'] == 'python'
     
+    def test_audit_entries_written_on_close(self, temp_config_dir):
+        """Test queued audit entries are flushed to disk on close"""
+        from claude_jester_desktop import DesktopConfig, DesktopAuditLogger, DesktopExecutionResult
+
+        config = DesktopConfig()
+        audit_logger = DesktopAuditLogger(config)
+
+        for i in range(3):
+            result = DesktopExecutionResult(
+                success=True, output=f"run {i}", error="", execution_time=0.1, memory_usage=0
+            )
+            audit_logger.log_execution(result, f"print({i})", "python")
+        audit_logger.close()
+
+        with open(audit_logger.audit_file) as f:
+            audit_entries = [json.loads(line) for line in f if line.strip()]
+
+        assert len(audit_entries) == 3
+        assert all(entry['language'] == 'python' for entry in audit_entries)
+
+    def test_audit_entries_flushed_on_timer(self):
+        """Test a lone buffered audit entry is flushed without further records"""
+        import logging
+        from claude_jester_desktop import _BatchingAuditHandler
+
+        target = Mock(spec=logging.Handler)
+        handler = _BatchingAuditHandler(target, flush_interval=0.05)
+        try:
+            handler.handle(logging.makeLogRecord({'msg': 'entry', 'levelno': logging.INFO}))
+            deadline = time.monotonic() + 2
+            while not target.handle.called and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert target.handle.call_count == 1
+        finally:
+            handler.close()
+
     def test_compliance_checking(self, desktop_server):
         """Test compliance flag detection"""
         audit_logger = desktop_server.audit_logger
@@ -491,6 +684,23 @@ class TestIntegration:
         assert result.success
         assert "quantum" in result.output.lower()
     
+    @pytest.mark.asyncio
+    async def test_slash_commands_keep_quotes(self, desktop_server):
+        """Test that apostrophes and quoted strings reach slash commands intact"""
+        desktop_server.config.quantum_debugging = True
+        desktop_server.config.performance_monitoring = True
+        
+        result = await desktop_server.execute_code_enhanced(
+            "slash",
+            "/quantum optimize Dijkstra's algorithm"
+        )
+        assert result.success
+        assert "Dijkstra's algorithm" in result.output
+        
+        output = await desktop_server._handle_performance_benchmark('print("hi there")', "python", 5)
+        assert 'print("hi there")' in output
+        assert "Iterations: 5" in output
+    
     @pytest.mark.asyncio
     async def test_security_scan_tool(self, desktop_server):
         """Test security scan tool integration"""
@@ -621,6 +831,59 @@ class TestPackaging:
                 files = zf.namelist()
                 assert "manifest.json" in files
                 assert "server/main.py" in files
+    
+    @pytest.mark.parametrize("raw_writes", [True, False])
+    def test_package_round_trip(self, raw_writes):
+        """Test the package reads back intact with and without precompressed writes"""
+        import build
+        
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch.object(build, "_RAW_ZIP_WRITES", raw_writes and build._RAW_ZIP_WRITES):
+            temp_path = Path(temp_dir)
+            manifest = {"dxt_version": "0.1", "name": "test-extension", "version": "1.0.0",
+                        "description": "Test", "server": {"type": "python", "entry_point": "server/main.py"}}
+            (temp_path / "manifest.json").write_text(json.dumps(manifest))
+            
+            builder = build.ExtensionBuilder(temp_path)
+            builder.clean()
+            (builder.build_dir / "manifest.json").write_text(json.dumps(manifest))
+            (builder.build_dir / "server").mkdir()
+            (builder.build_dir / "server" / "main.py").write_text("# Test server\n" * 200)
+            (builder.build_dir / "server" / "native.so").write_bytes(os.urandom(4096))
+            
+            dxt_path, _ = builder.create_package(manifest)
+            
+            with zipfile.ZipFile(dxt_path, 'r') as zf:
+                assert zf.testzip() is None
+                assert zf.read("server/main.py") == b"# Test server\n" * 200
+                assert zf.getinfo("server/native.so").compress_type == zipfile.ZIP_STORED
+    
+    def test_incremental_build_drops_deleted_sources(self):
+        """Test files deleted from the source are unstaged by an incremental build"""
+        import build
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            utils_dir = temp_path / "server" / "utils"
+            utils_dir.mkdir(parents=True)
+            (utils_dir / "keep.py").write_text("# kept")
+            (utils_dir / "gone.py").write_text("# deleted later")
+            
+            builder = build.ExtensionBuilder(temp_path, incremental=True)
+            builder.build_dir.mkdir()
+            builder.copy_server_files()
+            builder.save_file_hashes()
+            assert (builder.build_dir / "server" / "utils" / "gone.py").exists()
+            
+            (utils_dir / "gone.py").unlink()
+            builder = build.ExtensionBuilder(temp_path, incremental=True)
+            builder.copy_server_files()
+            builder.save_file_hashes()
+            
+            assert (builder.build_dir / "server" / "utils" / "keep.py").exists()
+            assert not (builder.build_dir / "server" / "utils" / "gone.py").exists()
+            hashes = json.loads((builder.build_dir / build.FILE_HASHES_NAME).read_text())
+            assert not any(key.endswith("gone.py") for key in hashes)
 
 # ===== PERFORMANCE BENCHMARKS =====
 